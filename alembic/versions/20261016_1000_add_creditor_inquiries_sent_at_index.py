@@ -0,0 +1,32 @@
+"""add_creditor_inquiries_sent_at_index
+
+Revision ID: 20261016_1000_inq_sent_at
+Revises: 20260526_1000_cc_bcc
+Create Date: 2026-10-16 10:00:00
+
+Matching candidate queries filter creditor_inquiries on a sent_at range and
+ORDER BY sent_at DESC LIMIT match_max_candidates. Without an index on
+sent_at that is a full scan + sort on every incoming email; with it Postgres
+walks the index backwards from received_at and stops at the limit.
+
+creditor_inquiries is owned by the Node.js portal, so use IF NOT EXISTS
+like the matching infrastructure migration does.
+"""
+from alembic import op
+
+
+revision = '20261016_1000_inq_sent_at'
+down_revision = '20260526_1000_cc_bcc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_creditor_inquiries_sent_at
+        ON creditor_inquiries (sent_at)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_creditor_inquiries_sent_at")
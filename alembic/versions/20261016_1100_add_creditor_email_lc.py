@@ -0,0 +1,46 @@
+"""add creditor_email_lc generated column to creditor_inquiries
+
+Revision ID: 20261016_1100_email_lc
+Revises: 20261016_1000_inq_sent_at
+Create Date: 2026-10-16 11:00:00
+
+Adds creditor_email_lc, a stored generated column (lower(creditor_email)),
+plus a btree index. The matcher compares senders against it so mixed-case
+From addresses still hit the exact-email tier, and gap deduplication can
+compare emails without lowercasing them in Python.
+
+The column is maintained by Postgres, so inserts from the Node.js portal
+need no changes.
+
+creditor_inquiries is owned by the Node.js portal, so both steps use IF NOT
+EXISTS like the sent_at index migration does. Adding a STORED generated
+column rewrites the whole table under an ACCESS EXCLUSIVE lock: portal
+reads and writes on creditor_inquiries block until the rewrite finishes, so
+run this upgrade in a low-traffic window. The index is built CONCURRENTLY
+(outside the migration transaction) so it does not extend that lock.
+"""
+from alembic import op
+
+revision = '20261016_1100_email_lc'
+down_revision = '20261016_1000_inq_sent_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE creditor_inquiries
+        ADD COLUMN IF NOT EXISTS creditor_email_lc VARCHAR(255)
+        GENERATED ALWAYS AS (lower(creditor_email)) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_creditor_inquiries_creditor_email_lc
+            ON creditor_inquiries (creditor_email_lc)
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_creditor_inquiries_creditor_email_lc")
+    op.execute("ALTER TABLE creditor_inquiries DROP COLUMN IF EXISTS creditor_email_lc")
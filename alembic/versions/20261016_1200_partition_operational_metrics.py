@@ -0,0 +1,101 @@
+"""partition operational_metrics by day
+
+Revision ID: 20261016_1200_ops_partition
+Revises: 20261016_1100_email_lc
+Create Date: 2026-10-16 12:00:00
+
+Recreates operational_metrics as a range-partitioned table on recorded_at
+with one partition per day (operational_metrics_pYYYYMMDD) plus a DEFAULT
+partition. Retention cleanup can then DROP whole expired partitions instead
+of DELETEing rows (no per-tuple WAL, no VACUUM churn), and the daily rollup
+only scans the partition for its day.
+
+The primary key becomes (id, recorded_at) because Postgres requires the
+partition key in every unique constraint; ids still come from the existing
+operational_metrics_id_seq sequence. Partitions for the retention window and
+the next week are created here; the daily rollup job keeps creating them
+ahead (see app/services/metrics_rollup.py).
+"""
+from datetime import date, timedelta
+
+from alembic import op
+
+revision = '20261016_1200_ops_partition'
+down_revision = '20261016_1100_email_lc'
+branch_labels = None
+depends_on = None
+
+# Keep in sync with the 30-day raw retention and PARTITION_DAYS_AHEAD in metrics_rollup
+RETENTION_DAYS = 30
+DAYS_AHEAD = 7
+
+
+def upgrade() -> None:
+    op.execute("ALTER SEQUENCE operational_metrics_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE operational_metrics_partitioned (
+            id INTEGER NOT NULL DEFAULT nextval('operational_metrics_id_seq'),
+            metric_type VARCHAR(50) NOT NULL,
+            metric_value DOUBLE PRECISION NOT NULL,
+            labels JSON,
+            email_id INTEGER REFERENCES incoming_emails (id) ON DELETE SET NULL,
+            recorded_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, recorded_at)
+        ) PARTITION BY RANGE (recorded_at)
+    """)
+    op.execute("""
+        CREATE TABLE operational_metrics_default
+        PARTITION OF operational_metrics_partitioned DEFAULT
+    """)
+
+    today = date.today()
+    day = today - timedelta(days=RETENTION_DAYS + 1)
+    while day <= today + timedelta(days=DAYS_AHEAD):
+        op.execute(f"""
+            CREATE TABLE operational_metrics_p{day:%Y%m%d}
+            PARTITION OF operational_metrics_partitioned
+            FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')
+        """)
+        day += timedelta(days=1)
+
+    op.execute("""
+        INSERT INTO operational_metrics_partitioned
+            (id, metric_type, metric_value, labels, email_id, recorded_at)
+        SELECT id, metric_type, metric_value, labels, email_id, recorded_at
+        FROM operational_metrics
+    """)
+    op.execute("DROP TABLE operational_metrics")
+    op.execute("ALTER TABLE operational_metrics_partitioned RENAME TO operational_metrics")
+    op.execute("ALTER SEQUENCE operational_metrics_id_seq OWNED BY operational_metrics.id")
+
+    op.create_index('idx_ops_metrics_type', 'operational_metrics', ['metric_type'])
+    op.create_index('idx_ops_metrics_recorded', 'operational_metrics', ['recorded_at'])
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE operational_metrics_id_seq OWNED BY NONE")
+
+    op.execute("""
+        CREATE TABLE operational_metrics_unpartitioned (
+            id INTEGER NOT NULL DEFAULT nextval('operational_metrics_id_seq') PRIMARY KEY,
+            metric_type VARCHAR(50) NOT NULL,
+            metric_value DOUBLE PRECISION NOT NULL,
+            labels JSON,
+            email_id INTEGER REFERENCES incoming_emails (id) ON DELETE SET NULL,
+            recorded_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        INSERT INTO operational_metrics_unpartitioned
+            (id, metric_type, metric_value, labels, email_id, recorded_at)
+        SELECT id, metric_type, metric_value, labels, email_id, recorded_at
+        FROM operational_metrics
+    """)
+    # Dropping the partitioned parent drops all of its partitions
+    op.execute("DROP TABLE operational_metrics")
+    op.execute("ALTER TABLE operational_metrics_unpartitioned RENAME TO operational_metrics")
+    op.execute("ALTER SEQUENCE operational_metrics_id_seq OWNED BY operational_metrics.id")
+
+    op.create_index('idx_ops_metrics_type', 'operational_metrics', ['metric_type'])
+    op.create_index('idx_ops_metrics_recorded', 'operational_metrics', ['recorded_at'])
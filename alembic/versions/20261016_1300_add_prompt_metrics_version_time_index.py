@@ -0,0 +1,29 @@
+"""add (prompt_template_id, extracted_at) index to prompt_performance_metrics
+
+Revision ID: 20261016_1300_prompt_metrics_idx
+Revises: 20261016_1200_ops_partition
+Create Date: 2026-10-16 13:00:00
+
+PromptMetricsService.get_version_stats aggregates one prompt version over a
+recent extracted_at window. With only the two single-column indexes Postgres
+has to pick one and filter the other column row by row; the composite index
+turns the lookup into a single index range scan.
+"""
+from alembic import op
+
+revision = '20261016_1300_prompt_metrics_idx'
+down_revision = '20261016_1200_ops_partition'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_prompt_metrics_prompt_extracted',
+        'prompt_performance_metrics',
+        ['prompt_template_id', 'extracted_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_prompt_metrics_prompt_extracted', table_name='prompt_performance_metrics')
@@ -17,6 +17,9 @@ from app.actors import broker
 
 logger = structlog.get_logger(__name__)
 
+# Client fields read during conflict detection (skip the rest of the document)
+CLIENT_PROJECTION = {'firstName': 1, 'lastName': 1, 'final_creditor_list': 1}
+
 
 @dramatiq.actor(
     broker=broker,
@@ -115,7 +118,9 @@ def consolidate_results(email_id: int) -> Dict[str, Any]:
         if mongodb_service.is_available():
             # Try multiple lookup strategies
             if email.zendesk_ticket_id:
-                client = mongodb_service.get_client_by_ticket(email.zendesk_ticket_id)
+                client = mongodb_service.get_client_by_ticket(
+                    email.zendesk_ticket_id, projection=CLIENT_PROJECTION
+                )
                 if client:
                     logger.info(
                         "mongodb_client_found_by_ticket",
@@ -130,7 +135,9 @@ def consolidate_results(email_id: int) -> Dict[str, Any]:
                 name_parts = client_name.strip().split(None, 1)
                 if len(name_parts) == 2:
                     first_name, last_name = name_parts
-                    client = mongodb_service.get_client_by_name(first_name, last_name)
+                    client = mongodb_service.get_client_by_name(
+                        first_name, last_name, projection=CLIENT_PROJECTION
+                    )
                     if client:
                         logger.info(
                             "mongodb_client_found_by_name",
@@ -216,6 +216,8 @@ def process_email(email_id: int, correlation_id: str = None) -> None:
 
     # Record start time for duration tracking
     start_time = time.time()
+    # Set once this run owns the email; skipped runs (locked/already done) record no duration
+    processing_started = False
 
     db = SessionLocal()
     try:
@@ -255,6 +257,7 @@ def process_email(email_id: int, correlation_id: str = None) -> None:
         email.processing_status = "processing"
         email.started_at = datetime.utcnow()
         db.commit()
+        processing_started = True
 
         logger.info("email_processing_started",
                    extra={"email_id": email_id,
@@ -1420,10 +1423,13 @@ def process_email(email_id: int, correlation_id: str = None) -> None:
         raise
 
     finally:
-        # Record processing time metric
+        # Record processing time metric, then write this run's buffered metrics
         try:
-            duration_ms = int((time.time() - start_time) * 1000)
-            metrics.record_processing_time("process_email", "complete", duration_ms, email_id=email_id)
+            if processing_started:
+                duration_ms = int((time.time() - start_time) * 1000)
+                metrics.record_processing_time("process_email", "complete", duration_ms, email_id=email_id)
+            metrics.flush()
+            db.commit()
         except Exception:
             pass  # Don't fail on metrics error
 
@@ -13,12 +13,16 @@ class Settings(BaseSettings):
     database_url: Optional[str] = None
     mongodb_url: Optional[str] = None
     mongodb_database: str = "test"  # Database name in MongoDB
+    mongodb_max_pool_size: int = 50  # Connections per process (web + worker threads share one client)
+    mongodb_min_pool_size: int = 5  # Kept warm so bursts skip TLS handshakes
+    mongodb_socket_timeout_ms: int = 10000  # Fail a stuck read/write instead of blocking the thread
 
     # Redis & Job Queue
     redis_url: Optional[str] = None
 
     # Environment
     environment: str = "development"
+    log_level: str = "INFO"  # LOG_LEVEL; DEBUG enables *_trace tracebacks in workers
 
     # Webhook
     webhook_secret: Optional[str] = None
@@ -82,6 +86,7 @@ class Settings(BaseSettings):
     match_lookback_days: int = 90  # creditor_inquiries window (increased from 30d for late creditor responses)
     match_threshold_high: float = 0.85  # High confidence threshold
     match_threshold_medium: float = 0.70  # Medium confidence threshold
+    match_max_candidates: int = 500  # Cap on candidate rows per email (newest sent_at first)
 
     # Confidence Routing Configuration (Phase 7)
     # USER DECISION: Global thresholds only, stored in env vars
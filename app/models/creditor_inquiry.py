@@ -3,7 +3,7 @@ CreditorInquiry Model
 Stores original inquiries sent to creditors via Zendesk
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Numeric, Text, Boolean
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Numeric, Text, Boolean
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -27,6 +27,8 @@ class CreditorInquiry(Base):
     # Creditor Information
     creditor_name = Column(String(255), nullable=False, index=True)
     creditor_email = Column(String(255), nullable=False, index=True)
+    # Lowercased creditor_email maintained by Postgres (case-insensitive sender matching)
+    creditor_email_lc = Column(String(255), Computed("lower(creditor_email)", persisted=True), index=True)
     creditor_name_normalized = Column(String(255), index=True)
 
     # Debt Information
@@ -66,7 +68,7 @@ class CreditorInquiry(Base):
     response_received = Column(Boolean, default=False)
 
     # Timestamps
-    sent_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
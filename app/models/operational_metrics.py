@@ -18,6 +18,10 @@ class OperationalMetrics(Base):
     """
     Raw operational metrics. Retention: 30 days. Cleaned by daily rollup job.
 
+    The table is range-partitioned by day on recorded_at (see the
+    partition_operational_metrics migration); its database primary key is
+    (id, recorded_at).
+
     Tracks:
     - queue_depth: Number of emails waiting in processing queue
     - processing_time_ms: Time taken for each processing stage
@@ -27,8 +31,8 @@ class OperationalMetrics(Base):
     """
     __tablename__ = "operational_metrics"
 
-    # Primary Key
-    id = Column(Integer, primary_key=True)
+    # Primary Key (composite with recorded_at, matching the partitioned table)
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     # Metric classification
     metric_type = Column(String(50), nullable=False, index=True)
@@ -48,7 +52,7 @@ class OperationalMetrics(Base):
     email_id = Column(Integer, ForeignKey("incoming_emails.id", ondelete="SET NULL"), nullable=True)
 
     # Timestamp
-    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    recorded_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True)
 
     def __repr__(self):
         return f"<OperationalMetrics(id={self.id}, type={self.metric_type}, value={self.metric_value})>"
@@ -44,6 +44,11 @@ class PromptPerformanceMetrics(Base):
     # Timestamp
     extracted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
 
+    __table_args__ = (
+        # Serves get_version_stats: one version over a recent extracted_at window
+        Index('idx_prompt_metrics_prompt_extracted', 'prompt_template_id', 'extracted_at'),
+    )
+
     def __repr__(self):
         return f"<PromptPerformanceMetrics(id={self.id}, prompt_template_id={self.prompt_template_id}, success={self.extraction_success})>"
 
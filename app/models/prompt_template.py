@@ -61,6 +61,9 @@ class PromptTemplate(Base):
         Index('idx_prompt_templates_active', 'task_type', 'name', postgresql_where=text('is_active = TRUE')),
     )
 
+    # Fetch server defaults (id, created_at) with INSERT ... RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         active_status = "ACTIVE" if self.is_active else "inactive"
         return f"<PromptTemplate({self.task_type}.{self.name} v{self.version} [{active_status}])>"
@@ -243,12 +243,9 @@ class EntityExtractorClaude:
                         manual_review_required=entities.confidence < 0.6,
                         execution_time_ms=execution_time_ms
                     )
-                    db.commit()
                 except Exception as metrics_error:
                     logger.warning(f"Failed to record metrics: {metrics_error}")
                     # Don't fail extraction if metrics recording fails
-                    if db:
-                        db.rollback()
 
             return entities
 
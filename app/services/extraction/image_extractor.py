@@ -300,12 +300,9 @@ class ImageExtractor:
                         manual_review_required=False,
                         execution_time_ms=execution_time_ms
                     )
-                    self.db.commit()
                 except Exception as metrics_error:
                     log.warning("metrics_recording_failed", error=str(metrics_error))
                     # Don't fail extraction if metrics recording fails
-                    if self.db:
-                        self.db.rollback()
 
             return parsed_result
 
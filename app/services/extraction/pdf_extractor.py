@@ -528,12 +528,9 @@ class PDFExtractor:
                         manual_review_required=False,
                         execution_time_ms=execution_time_ms
                     )
-                    self.db.commit()
                 except Exception as metrics_error:
                     log.warning("metrics_recording_failed", error=str(metrics_error))
                     # Don't fail extraction if metrics recording fails
-                    if self.db:
-                        self.db.rollback()
 
             return result
 
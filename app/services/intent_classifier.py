@@ -253,12 +253,9 @@ Antworte nur mit JSON:
                     manual_review_required=False,
                     execution_time_ms=execution_time_ms
                 )
-                db.commit()
             except Exception as metrics_error:
                 logger.warning("metrics_recording_failed", error=str(metrics_error))
                 # Don't fail classification if metrics recording fails
-                if db:
-                    db.rollback()
 
         return IntentResult(
             intent=intent,
@@ -7,12 +7,13 @@ and explainability builders for matching creditor answers to inquiries.
 
 from app.services.matching.signals import score_client_name, score_reference_numbers
 from app.services.matching.explainability import ExplainabilityBuilder
-from app.services.matching.thresholds import ThresholdManager
+from app.services.matching.thresholds import MatchingConfig, ThresholdManager
 from app.services.matching.strategies import (
     MatchingStrategy,
     ExactMatchStrategy,
     FuzzyMatchStrategy,
     CombinedStrategy,
+    SignalWeights,
     StrategyResult,
 )
 
@@ -24,10 +25,12 @@ __all__ = [
     "ExplainabilityBuilder",
     # Threshold management
     "ThresholdManager",
+    "MatchingConfig",
     # Strategies
     "MatchingStrategy",
     "ExactMatchStrategy",
     "FuzzyMatchStrategy",
     "CombinedStrategy",
+    "SignalWeights",
     "StrategyResult",
 ]
@@ -7,14 +7,34 @@ Design decisions:
 - RapidFuzz 3.x requires explicit preprocessing via processor parameter
 - Name matching uses multiple algorithms (token_sort, partial, token_set) and returns best
 - Reference matching handles OCR errors with fuzzy matching (not just exact)
+- Batch variants score all candidates of one email with one RapidFuzz
+  process.extract call per algorithm (C++ loop) and return the same
+  (score, details) tuples as the per-candidate scorers
 """
 
-from typing import Optional
-from rapidfuzz import fuzz, utils
+import logging
+from typing import Optional, Sequence
+from rapidfuzz import fuzz, process, utils
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Client name algorithms, in tie-break order:
+# token sort (word order), partial (substrings), token set (extra/missing tokens)
+NAME_SCORERS = (
+    ("token_sort_ratio", fuzz.token_sort_ratio),
+    ("partial_ratio", fuzz.partial_ratio),
+    ("token_set_ratio", fuzz.token_set_ratio),
+)
+NAME_SCORE_CUTOFF = 50
+
+# Reference algorithms, in tie-break order (only considered if reasonably close)
+REFERENCE_SCORERS = (
+    ("partial_ratio", fuzz.partial_ratio),
+    ("token_sort_ratio", fuzz.token_sort_ratio),
+)
+REFERENCE_SCORE_CUTOFF = 80
+
 
 def score_client_name(
     inquiry_name: str,
@@ -55,40 +75,90 @@ def score_client_name(
     # RapidFuzz 3.x: MUST use processor parameter for preprocessing
     # utils.default_process: lowercase + strip punctuation/whitespace
     scores = {}
+    for algorithm, scorer in NAME_SCORERS:
+        scores[algorithm] = scorer(
+            compare_name, extracted_name,
+            processor=utils.default_process,
+            score_cutoff=NAME_SCORE_CUTOFF  # Early exit optimization
+        ) / 100
+
+    return _best_name_score(inquiry_name, compare_name, extracted_name, scores)
+
+
+def score_client_names_batch(
+    inquiry_names: Sequence[tuple[Optional[str], Optional[str]]],
+    extracted_name: Optional[str]
+) -> list[tuple[float, dict]]:
+    """
+    Score many inquiry names against one extracted name.
+
+    Equivalent to calling score_client_name() per inquiry, but runs each
+    algorithm once over all candidates via rapidfuzz.process.extract, and
+    preprocesses the extracted name and each candidate name once per batch
+    instead of once per algorithm and candidate.
 
-    # Algorithm 1: Token sort (handles word order)
-    scores["token_sort_ratio"] = fuzz.token_sort_ratio(
-        compare_name, extracted_name,
-        processor=utils.default_process,
-        score_cutoff=50  # Early exit optimization
-    ) / 100
-
-    # Algorithm 2: Partial ratio (handles substring matches)
-    scores["partial_ratio"] = fuzz.partial_ratio(
-        compare_name, extracted_name,
-        processor=utils.default_process,
-        score_cutoff=50
-    ) / 100
-
-    # Algorithm 3: Token set (handles extra/missing tokens)
-    scores["token_set_ratio"] = fuzz.token_set_ratio(
-        compare_name, extracted_name,
-        processor=utils.default_process,
-        score_cutoff=50
-    ) / 100
+    Args:
+        inquiry_names: (client_name, client_name_normalized) per candidate
+        extracted_name: Client name extracted from creditor answer
 
+    Returns:
+        List of (score, scoring_details) in the order of inquiry_names
+    """
+    if not extracted_name:
+        return [score_client_name(name, normalized, extracted_name) for name, normalized in inquiry_names]
+
+    # Missing inquiry names become None choices, which process.extract skips
+    choices = [(normalized or name) if name else None for name, normalized in inquiry_names]
+
+    # Run default_process once per string here rather than once per string
+    # per algorithm inside process.extract
+    processed_query = utils.default_process(extracted_name)
+    processed_choices = [
+        utils.default_process(choice) if choice is not None else None for choice in choices
+    ]
+
+    all_scores: list[dict] = [{} for _ in choices]
+    for algorithm, scorer in NAME_SCORERS:
+        for score_dict in all_scores:
+            score_dict[algorithm] = 0.0
+        for _, score, index in process.extract(
+            processed_query, processed_choices,
+            scorer=scorer,
+            processor=None,
+            score_cutoff=NAME_SCORE_CUTOFF,
+            limit=None
+        ):
+            all_scores[index][algorithm] = score / 100
+
+    results = []
+    for (name, _), compare_name, scores in zip(inquiry_names, choices, all_scores):
+        if compare_name is None:
+            results.append(score_client_name(name, None, extracted_name))
+        else:
+            results.append(_best_name_score(name, compare_name, extracted_name, scores))
+    return results
+
+
+def _best_name_score(
+    inquiry_name: str,
+    compare_name: str,
+    extracted_name: str,
+    scores: dict
+) -> tuple[float, dict]:
+    """Pick the best algorithm score and build the client name scoring details."""
     # Return best score across all algorithms
     best_score = max(scores.values())
     best_algorithm = max(scores, key=scores.get)
 
-    # Log detailed matching info for debugging
-    logger.debug("client_name_score_details",
-                inquiry_name=inquiry_name,
-                extracted_name=extracted_name,
-                compare_name=compare_name,
-                best_score=best_score,
-                best_algorithm=best_algorithm,
-                all_scores=scores)
+    # Log detailed matching info for debugging (runs per candidate; skip when disabled)
+    if logger.is_enabled_for(logging.DEBUG):
+        logger.debug("client_name_score_details",
+                    inquiry_name=inquiry_name,
+                    extracted_name=extracted_name,
+                    compare_name=compare_name,
+                    best_score=best_score,
+                    best_algorithm=best_algorithm,
+                    all_scores=scores)
 
     return best_score, {
         "algorithm_used": best_algorithm,
@@ -152,7 +222,7 @@ def score_reference_numbers(
         # Strategy 2: Partial ratio (handles OCR errors and missing prefix/suffix)
         partial_score = fuzz.partial_ratio(
             normalized_inquiry, normalized_extracted,
-            score_cutoff=80  # Only consider if reasonably close
+            score_cutoff=REFERENCE_SCORE_CUTOFF  # Only consider if reasonably close
         ) / 100
 
         if partial_score > best_score:
@@ -163,7 +233,7 @@ def score_reference_numbers(
         # Strategy 3: Token sort (handles word order changes)
         token_score = fuzz.token_sort_ratio(
             normalized_inquiry, normalized_extracted,
-            score_cutoff=80
+            score_cutoff=REFERENCE_SCORE_CUTOFF
         ) / 100
 
         if token_score > best_score:
@@ -176,3 +246,84 @@ def score_reference_numbers(
         "algorithm_used": best_algorithm or "none",
         "raw_score": best_score
     }
+
+
+def score_reference_numbers_batch(
+    inquiry_references: Sequence[Optional[str]],
+    extracted_references: list[str]
+) -> list[tuple[float, dict]]:
+    """
+    Score many inquiry references against the extracted references.
+
+    Equivalent to calling score_reference_numbers() per inquiry, but runs each
+    algorithm once per extracted reference over all candidates via
+    rapidfuzz.process.extract.
+
+    Args:
+        inquiry_references: Reference number per candidate (may be None)
+        extracted_references: Reference numbers extracted from creditor answer
+
+    Returns:
+        List of (score, scoring_details) in the order of inquiry_references
+    """
+    if not extracted_references:
+        return [score_reference_numbers(ref, extracted_references) for ref in inquiry_references]
+
+    normalized_extracted = [ref.upper().strip() for ref in extracted_references]
+    exact_lookup: dict[str, str] = {}
+    for normalized, original in zip(normalized_extracted, extracted_references):
+        exact_lookup.setdefault(normalized, original)
+
+    choices = [ref.upper().strip() if ref else None for ref in inquiry_references]
+
+    # fuzzy[j][algorithm] -> {candidate index: score} for extracted reference j
+    fuzzy = []
+    for normalized in normalized_extracted:
+        per_algorithm = {}
+        for algorithm, scorer in REFERENCE_SCORERS:
+            per_algorithm[algorithm] = {
+                index: score / 100
+                for _, score, index in process.extract(
+                    normalized, choices,
+                    scorer=scorer,
+                    processor=None,
+                    score_cutoff=REFERENCE_SCORE_CUTOFF,
+                    limit=None
+                )
+            }
+        fuzzy.append(per_algorithm)
+
+    results = []
+    for index, (inquiry_reference, normalized_inquiry) in enumerate(zip(inquiry_references, choices)):
+        if normalized_inquiry is None:
+            results.append(score_reference_numbers(inquiry_reference, extracted_references))
+            continue
+
+        # Strategy 1: Exact match (first matching extracted reference wins)
+        exact_ref = exact_lookup.get(normalized_inquiry)
+        if exact_ref is not None:
+            results.append((1.0, {
+                "matched_reference": exact_ref,
+                "algorithm_used": "exact",
+                "raw_score": 1.0
+            }))
+            continue
+
+        # Strategies 2 + 3 in the same order as score_reference_numbers()
+        best_score = 0.0
+        best_match = None
+        best_algorithm = None
+        for extracted_ref, per_algorithm in zip(extracted_references, fuzzy):
+            for algorithm, _ in REFERENCE_SCORERS:
+                score = per_algorithm[algorithm].get(index, 0.0)
+                if score > best_score:
+                    best_score = score
+                    best_match = extracted_ref
+                    best_algorithm = algorithm
+
+        results.append((best_score, {
+            "matched_reference": best_match,
+            "algorithm_used": best_algorithm or "none",
+            "raw_score": best_score
+        }))
+    return results
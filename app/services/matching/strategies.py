@@ -9,12 +9,18 @@ Design decisions from CONTEXT.MD:
 - Signal scorers from signals.py provide core matching logic
 """
 
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple, Optional, Any, TYPE_CHECKING
+from typing import Dict, List, NamedTuple, Tuple, Optional, Any, Sequence, Union, TYPE_CHECKING
 from dataclasses import dataclass
 import structlog
 
-from app.services.matching.signals import score_client_name, score_reference_numbers
+from app.services.matching.signals import (
+    score_client_name,
+    score_client_names_batch,
+    score_reference_numbers,
+    score_reference_numbers_batch,
+)
 
 if TYPE_CHECKING:
     from app.models.creditor_inquiry import CreditorInquiry
@@ -22,6 +28,19 @@ if TYPE_CHECKING:
 logger = structlog.get_logger(__name__)
 
 
+class SignalWeights(NamedTuple):
+    """Signal weights resolved once per batch (attribute access instead of dict lookups)."""
+    client_name: float = 0.4
+    reference_number: float = 0.6
+
+    @classmethod
+    def from_dict(cls, weights: Dict[str, float]) -> "SignalWeights":
+        return cls(
+            client_name=weights.get("client_name", 0.4),
+            reference_number=weights.get("reference_number", 0.6),
+        )
+
+
 @dataclass
 class StrategyResult:
     """Result from a matching strategy evaluation."""
@@ -39,7 +58,7 @@ class MatchingStrategy(ABC):
         self,
         inquiry: "CreditorInquiry",
         extracted_data: Dict[str, Any],
-        weights: Dict[str, float]
+        weights: Union[Dict[str, float], SignalWeights]
     ) -> StrategyResult:
         """
         Evaluate match between inquiry and extracted data.
@@ -47,13 +66,31 @@ class MatchingStrategy(ABC):
         Args:
             inquiry: CreditorInquiry object from database
             extracted_data: Extracted data from creditor answer
-            weights: Signal weights (e.g., {"client_name": 0.4, "reference_number": 0.6})
+            weights: Signal weights (e.g., {"client_name": 0.4, "reference_number": 0.6}),
+                or a SignalWeights built once per batch
 
         Returns:
             StrategyResult with score and scoring details
         """
         pass
 
+    def evaluate_batch(
+        self,
+        inquiries: Sequence["CreditorInquiry"],
+        extracted_data: Dict[str, Any],
+        weights: Union[Dict[str, float], SignalWeights]
+    ) -> List[StrategyResult]:
+        """
+        Evaluate all candidates of one email.
+
+        Default: evaluate() per inquiry. Fuzzy strategies override this to
+        score every candidate with one batched RapidFuzz call per algorithm.
+
+        Returns:
+            One StrategyResult per inquiry, in input order
+        """
+        return [self.evaluate(inquiry, extracted_data, weights) for inquiry in inquiries]
+
 
 class ExactMatchStrategy(MatchingStrategy):
     """
@@ -61,25 +98,62 @@ class ExactMatchStrategy(MatchingStrategy):
     Returns 1.0 only if both name AND reference match exactly (case-insensitive).
     """
 
+    @staticmethod
+    def normalized_refs(extracted_refs: List[str]) -> Dict[str, str]:
+        """Map lower/strip-normalized extracted ref -> original ref."""
+        lookup: Dict[str, str] = {}
+        for ref in extracted_refs or []:
+            lookup.setdefault(ref.lower().strip(), ref)
+        return lookup
+
+    @staticmethod
+    def matched_reference(inquiry_ref: Optional[str], ref_lookup: Dict[str, str]) -> Optional[str]:
+        """Return the extracted ref that exactly matches inquiry_ref, if any."""
+        if not inquiry_ref or not ref_lookup:
+            return None
+        return ref_lookup.get(inquiry_ref.lower().strip())
+
     def evaluate(
         self,
         inquiry: "CreditorInquiry",
         extracted_data: Dict[str, Any],
-        weights: Dict[str, float]
+        weights: Union[Dict[str, float], SignalWeights]
     ) -> StrategyResult:
+        return self.score(
+            inquiry,
+            extracted_data.get("client_name", ""),
+            self.normalized_refs(extracted_data.get("reference_numbers", [])),
+        )
+
+    def evaluate_batch(
+        self,
+        inquiries: Sequence["CreditorInquiry"],
+        extracted_data: Dict[str, Any],
+        weights: Union[Dict[str, float], SignalWeights]
+    ) -> List[StrategyResult]:
+        # extracted_data is shared by every candidate, so normalize its
+        # reference list once per call and probe the lookup per candidate.
         extracted_name = extracted_data.get("client_name", "")
-        extracted_refs = extracted_data.get("reference_numbers", [])
+        ref_lookup = self.normalized_refs(extracted_data.get("reference_numbers", []))
+        return [self.score(inquiry, extracted_name, ref_lookup) for inquiry in inquiries]
+
+    def score(
+        self,
+        inquiry: "CreditorInquiry",
+        extracted_name: Optional[str],
+        ref_lookup: Dict[str, str]
+    ) -> StrategyResult:
+        """Score one inquiry against the extracted name and normalized ref lookup."""
         inquiry_ref = inquiry.reference_number or ""
 
         # Exact name match (case-insensitive, normalized)
         inquiry_name = (inquiry.client_name_normalized or inquiry.client_name or "").lower().strip()
         name_match = extracted_name.lower().strip() == inquiry_name if extracted_name else False
 
-        # Exact reference match
-        ref_match = any(
-            ref.lower().strip() == inquiry_ref.lower().strip()
-            for ref in extracted_refs
-        ) if extracted_refs and inquiry_ref else False
+        # Exact reference match (O(1) dict probe instead of scanning extracted refs)
+        ref_match = (
+            inquiry_ref.lower().strip() in ref_lookup
+        ) if ref_lookup and inquiry_ref else False
 
         # CONTEXT.MD: Both signals required
         if name_match and ref_match:
@@ -113,7 +187,7 @@ class FuzzyMatchStrategy(MatchingStrategy):
         self,
         inquiry: "CreditorInquiry",
         extracted_data: Dict[str, Any],
-        weights: Dict[str, float]
+        weights: Union[Dict[str, float], SignalWeights]
     ) -> StrategyResult:
         extracted_name = extracted_data.get("client_name")
         extracted_refs = extracted_data.get("reference_numbers", [])
@@ -131,6 +205,36 @@ class FuzzyMatchStrategy(MatchingStrategy):
             extracted_refs
         )
 
+        return self.combine(name_score, name_details, ref_score, ref_details, weights)
+
+    def evaluate_batch(
+        self,
+        inquiries: Sequence["CreditorInquiry"],
+        extracted_data: Dict[str, Any],
+        weights: Union[Dict[str, float], SignalWeights]
+    ) -> List[StrategyResult]:
+        name_signals = score_client_names_batch(
+            [(inquiry.client_name, inquiry.client_name_normalized) for inquiry in inquiries],
+            extracted_data.get("client_name")
+        )
+        ref_signals = score_reference_numbers_batch(
+            [inquiry.reference_number for inquiry in inquiries],
+            extracted_data.get("reference_numbers", [])
+        )
+        return [
+            self.combine(name_score, name_details, ref_score, ref_details, weights)
+            for (name_score, name_details), (ref_score, ref_details) in zip(name_signals, ref_signals)
+        ]
+
+    def combine(
+        self,
+        name_score: float,
+        name_details: Dict,
+        ref_score: float,
+        ref_details: Dict,
+        weights: Union[Dict[str, float], SignalWeights]
+    ) -> StrategyResult:
+        """Combine name and reference signal scores into a StrategyResult."""
         # Matching logic:
         # 1. Strong ref match without name → allow (creditor often doesn't mention Mandant)
         # 2. Strong name match without ref → allow (AZ often not known at inquiry creation)
@@ -140,28 +244,30 @@ class FuzzyMatchStrategy(MatchingStrategy):
             # Strong reference match without name - creditor replied with our AZ
             # but didn't mention the client name (very common)
             total_score = ref_score * 0.85
-            logger.debug("ref_only_match_allowed",
-                        name_score=name_score,
-                        ref_score=ref_score,
-                        total_score=total_score)
+            if logger.is_enabled_for(logging.DEBUG):
+                logger.debug("ref_only_match_allowed",
+                            name_score=name_score,
+                            ref_score=ref_score,
+                            total_score=total_score)
         elif name_score == 0 and ref_score == 0:
             total_score = 0.0
         elif name_score >= 0.85 and ref_score == 0:
             # Strong name match without reference - allow with reduced confidence
             # This handles cases where creditor's Aktenzeichen wasn't known initially
             total_score = name_score * 0.85  # Reduced penalty - domain match provides additional signal
-            logger.debug("name_only_match_allowed",
-                        name_score=name_score,
-                        ref_score=ref_score,
-                        total_score=total_score)
+            if logger.is_enabled_for(logging.DEBUG):
+                logger.debug("name_only_match_allowed",
+                            name_score=name_score,
+                            ref_score=ref_score,
+                            total_score=total_score)
         elif ref_score == 0:
             # Weak name match without reference - no match
             total_score = 0.0
         else:
             # Both signals available - weighted average
-            name_weight = weights.get("client_name", 0.4)
-            ref_weight = weights.get("reference_number", 0.6)
-            total_score = (name_score * name_weight) + (ref_score * ref_weight)
+            if not isinstance(weights, SignalWeights):
+                weights = SignalWeights.from_dict(weights)
+            total_score = (name_score * weights.client_name) + (ref_score * weights.reference_number)
 
         return StrategyResult(
             score=total_score,
@@ -177,39 +283,107 @@ class FuzzyMatchStrategy(MatchingStrategy):
         )
 
 
+# Shared instances reused by every CombinedStrategy (see CombinedStrategy.__init__)
+_EXACT = ExactMatchStrategy()
+_FUZZY = FuzzyMatchStrategy()
+
+
 class CombinedStrategy(MatchingStrategy):
     """
     Combined strategy: try exact first, fall back to fuzzy.
     Provides best of both: fast exact matches, robust fuzzy fallback.
+
+    The fallback only runs the fuzzy scorers for signals that did not
+    already match exactly (batched across all candidates of an email), then
+    combines them with FuzzyMatchStrategy.combine.
     """
 
     def __init__(self):
-        self.exact = ExactMatchStrategy()
-        self.fuzzy = FuzzyMatchStrategy()
+        # Sub-strategies hold no per-request state; share one instance of each
+        self.exact = _EXACT
+        self.fuzzy = _FUZZY
 
     def evaluate(
         self,
         inquiry: "CreditorInquiry",
         extracted_data: Dict[str, Any],
-        weights: Dict[str, float]
+        weights: Union[Dict[str, float], SignalWeights]
     ) -> StrategyResult:
-        # Try exact match first
-        exact_result = self.exact.evaluate(inquiry, extracted_data, weights)
-
-        if exact_result.score == 1.0:
-            logger.debug("combined_strategy_exact_match",
-                        inquiry_id=inquiry.id,
-                        score=exact_result.score)
-            exact_result.strategy_used = "combined_exact"
-            return exact_result
-
-        # Fall back to fuzzy
-        fuzzy_result = self.fuzzy.evaluate(inquiry, extracted_data, weights)
-        fuzzy_result.strategy_used = "combined_fuzzy"
+        return self.evaluate_batch([inquiry], extracted_data, weights)[0]
 
-        logger.debug("combined_strategy_fuzzy_fallback",
-                    inquiry_id=inquiry.id,
-                    exact_score=exact_result.score,
-                    fuzzy_score=fuzzy_result.score)
+    def evaluate_batch(
+        self,
+        inquiries: Sequence["CreditorInquiry"],
+        extracted_data: Dict[str, Any],
+        weights: Union[Dict[str, float], SignalWeights]
+    ) -> List[StrategyResult]:
+        # Try exact match first
+        results: List[StrategyResult] = self.exact.evaluate_batch(inquiries, extracted_data, weights)
+
+        fallback = []
+        for index, (inquiry, exact_result) in enumerate(zip(inquiries, results)):
+            if exact_result.score == 1.0:
+                if logger.is_enabled_for(logging.DEBUG):
+                    logger.debug("combined_strategy_exact_match",
+                                inquiry_id=inquiry.id,
+                                score=exact_result.score)
+                exact_result.strategy_used = "combined_exact"
+            else:
+                fallback.append(index)
+
+        if not fallback:
+            return results
+
+        # Fall back to fuzzy. A signal that already matched exactly would score
+        # 1.0 in the fuzzy scorers too, so reuse it instead of re-scoring it;
+        # the remaining signals are scored in one batch across candidates.
+        extracted_name = extracted_data.get("client_name")
+        extracted_refs = extracted_data.get("reference_numbers", [])
 
-        return fuzzy_result
+        name_indices = [i for i in fallback if results[i].component_scores["client_name"] != 1.0]
+        name_signals = dict(zip(name_indices, score_client_names_batch(
+            [(inquiries[i].client_name, inquiries[i].client_name_normalized) for i in name_indices],
+            extracted_name
+        )))
+        ref_indices = [i for i in fallback if results[i].component_scores["reference"] != 1.0]
+        ref_signals = dict(zip(ref_indices, score_reference_numbers_batch(
+            [inquiries[i].reference_number for i in ref_indices],
+            extracted_refs
+        )))
+        ref_lookup = self.exact.normalized_refs(extracted_refs)
+
+        for index in fallback:
+            inquiry = inquiries[index]
+            exact_result = results[index]
+
+            if index in name_signals:
+                name_score, name_details = name_signals[index]
+            else:
+                name_score, name_details = 1.0, {
+                    "algorithm_used": "exact",
+                    "inquiry_value": inquiry.client_name,
+                    "extracted_value": extracted_name,
+                    "all_scores": {"exact": 1.0}
+                }
+
+            if index in ref_signals:
+                ref_score, ref_details = ref_signals[index]
+            else:
+                ref_score, ref_details = 1.0, {
+                    "matched_reference": self.exact.matched_reference(inquiry.reference_number, ref_lookup),
+                    "algorithm_used": "exact",
+                    "raw_score": 1.0
+                }
+
+            fuzzy_result = self.fuzzy.combine(name_score, name_details, ref_score, ref_details, weights)
+            fuzzy_result.strategy_used = "combined_fuzzy"
+
+            if logger.is_enabled_for(logging.DEBUG):
+                logger.debug("combined_strategy_fuzzy_fallback",
+                            inquiry_id=inquiry.id,
+                            exact_score=exact_result.score,
+                            fuzzy_score=fuzzy_result.score)
+
+            results[index] = fuzzy_result
+
+        return results
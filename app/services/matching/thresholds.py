@@ -10,7 +10,9 @@ Design from CONTEXT.MD:
 - Fallback to hardcoded defaults if database empty
 """
 
-from typing import Dict, Optional
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 import structlog
 
@@ -19,12 +21,24 @@ from app.models.matching_config import MatchingThreshold
 logger = structlog.get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class MatchingConfig:
+    """Thresholds and signal weights resolved for one creditor category."""
+    min_match: float
+    gap_threshold: float
+    weights: Dict[str, float]
+
+
 class ThresholdManager:
     """
     Runtime threshold lookup with category-based overrides.
 
     CONTEXT.MD: Thresholds stored in PostgreSQL for runtime changes without deployment.
     Developers manage via direct database access (no admin API needed).
+
+    Lookups are cached in-process for CACHE_TTL_SECONDS. The cache is shared
+    across instances (a new ThresholdManager is created per email), so a
+    threshold change in the database takes effect within one TTL window.
     """
 
     # Hardcoded fallbacks if database has no config
@@ -32,9 +46,33 @@ class ThresholdManager:
     DEFAULT_GAP_THRESHOLD = 0.15
     DEFAULT_WEIGHTS = {"client_name": 0.40, "reference_number": 0.60}
 
+    # Thresholds are near-static config; re-read from the database at most once per TTL
+    CACHE_TTL_SECONDS = 60.0
+
+    # (kind, category, threshold_type) -> (expires_at, value); shared by all instances
+    _shared_cache: Dict[Tuple[str, str, Optional[str]], Tuple[float, Any]] = {}
+
     def __init__(self, db: Session):
         self.db = db
-        self._cache: Dict[str, any] = {}  # Optional performance cache
+        self._cache = ThresholdManager._shared_cache
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached thresholds/weights (e.g. after editing matching_thresholds)."""
+        cls._shared_cache.clear()
+
+    def _cache_get(self, key: Tuple[str, str, Optional[str]]) -> Optional[Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._cache.pop(key, None)
+            return None
+        return value
+
+    def _cache_set(self, key: Tuple[str, str, Optional[str]], value: Any) -> None:
+        self._cache[key] = (time.monotonic() + self.CACHE_TTL_SECONDS, value)
 
     def get_threshold(self, creditor_category: str, threshold_type: str) -> float:
         """
@@ -47,6 +85,17 @@ class ThresholdManager:
         Returns:
             Threshold value (0.0-1.0)
         """
+        key = ("threshold", creditor_category, threshold_type)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        value = self._load_threshold(creditor_category, threshold_type)
+        self._cache_set(key, value)
+        return value
+
+    def _load_threshold(self, creditor_category: str, threshold_type: str) -> float:
+        """Read threshold from database (category -> default -> hardcoded)."""
         # Try category-specific first
         threshold = self.db.query(MatchingThreshold).filter(
             MatchingThreshold.category == creditor_category,
@@ -90,6 +139,16 @@ class ThresholdManager:
         Returns:
             Dict with weight_name -> weight_value
         """
+        key = ("weights", creditor_category, None)
+        cached = self._cache_get(key)
+        if cached is None:
+            cached = self._load_weights(creditor_category)
+            self._cache_set(key, cached)
+        # Callers may mutate the returned dict; never hand out the cached instance
+        return dict(cached)
+
+    def _load_weights(self, creditor_category: str) -> Dict[str, float]:
+        """Read weights from database (category -> default -> hardcoded)."""
         weights = self.db.query(MatchingThreshold).filter(
             MatchingThreshold.category == creditor_category,
             MatchingThreshold.weight_name.isnot(None)
@@ -118,3 +177,22 @@ class ThresholdManager:
     def get_gap_threshold(self, creditor_category: str = "default") -> float:
         """Convenience method for gap_threshold."""
         return self.get_threshold(creditor_category, "gap_threshold")
+
+    def get_config(self, creditor_category: str = "default") -> MatchingConfig:
+        """
+        Get min_match, gap_threshold and weights for a category in one lookup.
+
+        The resolved config is cached as a whole, so a warm call costs a single
+        cache hit instead of three.
+        """
+        key = ("config", creditor_category, None)
+        cached = self._cache_get(key)
+        if cached is None:
+            cached = MatchingConfig(
+                min_match=self.get_min_match(creditor_category),
+                gap_threshold=self.get_gap_threshold(creditor_category),
+                weights=self.get_weights(creditor_category),
+            )
+            self._cache_set(key, cached)
+        # Same contract as get_weights: the caller gets its own weights dict
+        return replace(cached, weights=dict(cached.weights))
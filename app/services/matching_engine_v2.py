@@ -14,11 +14,12 @@ CONTEXT.MD DECISIONS (LOCKED):
 - Gap threshold for ambiguity routing to manual review
 """
 
+import heapq
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, func, insert, literal_column, select, union_all
 import structlog
 
 from app.models import CreditorInquiry, MatchResult, IncomingEmail
@@ -26,6 +27,7 @@ from app.services.matching import (
     ThresholdManager,
     CombinedStrategy,
     ExplainabilityBuilder,
+    SignalWeights,
     StrategyResult,
 )
 from app.config import settings
@@ -35,8 +37,28 @@ logger = structlog.get_logger(__name__)
 # Default lookback window — sourced from config (env: MATCH_LOOKBACK_DAYS, default 90)
 DEFAULT_LOOKBACK_DAYS = settings.match_lookback_days
 
+# Strategies are stateless per request; one shared default instead of one per email
+_DEFAULT_STRATEGY = CombinedStrategy()
+
+# Ranking: _decide_match reads at most the top 3 (plus a few more for gap
+# dedup), so large pools are partially selected instead of fully sorted
+RANK_TOP_K = 5
+RANK_FULL_SORT_MAX = 16
+
+# Columns scoring, explainability and gap dedup read from a candidate; the
+# rest (email_body, subject, routing fields) load lazily only if touched
+_CANDIDATE_LOAD_ONLY = load_only(
+    CreditorInquiry.id,
+    CreditorInquiry.client_name,
+    CreditorInquiry.client_name_normalized,
+    CreditorInquiry.creditor_email,
+    CreditorInquiry.creditor_email_lc,
+    CreditorInquiry.reference_number,
+    CreditorInquiry.sent_at,
+)
+
 
-@dataclass
+@dataclass(slots=True)
 class MatchCandidate:
     """
     Represents a single match candidate with scores and explainability.
@@ -59,7 +81,7 @@ class MatchCandidate:
             return "low"
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchingResult:
     """
     Result of the matching process.
@@ -112,9 +134,10 @@ class MatchingEngineV2:
             kanzlei_id: Tenant ID — if set, only match against this kanzlei's inquiries
         """
         self.db = db
-        self.strategy = strategy or CombinedStrategy()
+        self.strategy = strategy or _DEFAULT_STRATEGY
         self.lookback_days = lookback_days
         self.kanzlei_id = kanzlei_id
+        self.max_candidates = settings.match_max_candidates
         self.threshold_manager = ThresholdManager(db)
 
         logger.info("matching_engine_v2_initialized",
@@ -135,7 +158,7 @@ class MatchingEngineV2:
 
         CONTEXT.MD Implementation:
         1. Filter candidates by creditor_inquiries 30-day window
-        2. Score each candidate using strategy (both signals required)
+        2. Score all candidates using strategy (batched; both signals required)
         3. Apply gap threshold for ambiguity detection
         4. Build explainability JSONB for all candidates
 
@@ -170,9 +193,10 @@ class MatchingEngineV2:
         log.info("candidates_found", count=len(candidates))
 
         # Step 2: Get thresholds and weights
-        min_threshold = self.threshold_manager.get_min_match(creditor_category)
-        gap_threshold = self.threshold_manager.get_gap_threshold(creditor_category)
-        weights = self.threshold_manager.get_weights(creditor_category)
+        config = self.threshold_manager.get_config(creditor_category)
+        min_threshold = config.min_match
+        gap_threshold = config.gap_threshold
+        weights = config.weights
 
         log.debug("thresholds_loaded",
                  min_threshold=min_threshold,
@@ -180,9 +204,11 @@ class MatchingEngineV2:
                  weights=weights)
 
         # Step 3: Score each candidate
+        # Resolve weights once for the batch; the dict is kept for explainability
+        signal_weights = SignalWeights.from_dict(weights)
         match_candidates: List[MatchCandidate] = []
-        for inquiry in candidates:
-            strategy_result = self.strategy.evaluate(inquiry, extracted_data, weights)
+        strategy_results = self.strategy.evaluate_batch(candidates, extracted_data, signal_weights)
+        for inquiry, strategy_result in zip(candidates, strategy_results):
 
             # Build explainability JSONB
             scoring_details = ExplainabilityBuilder.build(
@@ -207,12 +233,9 @@ class MatchingEngineV2:
             )
             match_candidates.append(match_candidate)
 
-        # Step 4: Sort by score (descending), then by recency (newest first)
+        # Step 4: Rank by score (descending), then by recency (newest first)
         # Tiebreaker: prefer newest inquiry (2. Schreiben over 1. Schreiben)
-        match_candidates.sort(
-            key=lambda x: (x.total_score, x.inquiry.sent_at or datetime.min),
-            reverse=True
-        )
+        match_candidates = self._rank_candidates(match_candidates)
 
         # Log top candidates
         for i, mc in enumerate(match_candidates[:3], 1):
@@ -245,10 +268,16 @@ class MatchingEngineV2:
         Multi-tenant isolation: When kanzlei_id is set, ALL queries are scoped
         to that tenant. This prevents cross-tenant data leakage.
 
-        Priority matching:
-        1. Exact email match (from_email == creditor_email)
+        The result is capped at settings.match_max_candidates rows (newest
+        first), which bounds scoring cost as the inquiry history grows.
+
+        Priority matching (only the best tier with any rows is returned):
+        1. Exact email match (case-insensitive, via creditor_email_lc)
         2. Domain match (same domain)
         3. All other inquiries in time window (fallback)
+
+        All three tiers are resolved in one round-trip: a UNION ALL with one
+        LIMITed branch per tier, filtered to the best tier that has rows.
         """
         lookback_date = received_at - timedelta(days=self.lookback_days)
 
@@ -264,55 +293,80 @@ class MatchingEngineV2:
         if self.kanzlei_id:
             base_filters.append(CreditorInquiry.kanzlei_id == self.kanzlei_id)
 
-        # First try: Exact email match
-        exact_matches = self.db.query(CreditorInquiry).filter(
-            and_(
-                *base_filters,
-                CreditorInquiry.creditor_email == from_email
-            )
+        # One branch per tier (1 = exact email, 2 = same domain, 3 = anything
+        # else), each with its own ORDER BY sent_at DESC LIMIT. Every branch
+        # stops after max_candidates rows: the exact tier is served by the
+        # creditor_email_lc index, the others walk the sent_at index. Rows in
+        # tier 3 also appear in better tiers, but tier 3 is only kept when
+        # those are empty.
+        sender_email_lc = from_email.lower()
+        tier_conditions = [(1, CreditorInquiry.creditor_email_lc == sender_email_lc)]
+        if sender_domain:
+            tier_conditions.append((2, CreditorInquiry.creditor_email_lc.like(f'%@{sender_domain}')))
+        tier_conditions.append((3, None))
+
+        branches = []
+        for tier_priority, condition in tier_conditions:
+            filters = base_filters if condition is None else [*base_filters, condition]
+            branch = select(
+                CreditorInquiry.id.label("inquiry_id"),
+                literal_column(str(tier_priority)).label("priority"),
+            ).where(and_(*filters)).order_by(
+                CreditorInquiry.sent_at.desc()
+            ).limit(self.max_candidates).subquery()
+            branches.append(select(branch.c.inquiry_id, branch.c.priority))
+
+        tiers = union_all(*branches).cte("candidate_tiers")
+        best_priority = select(func.min(tiers.c.priority)).scalar_subquery()
+
+        # One round-trip: keep only the best tier present
+        candidates = self.db.query(CreditorInquiry).options(
+            _CANDIDATE_LOAD_ONLY
+        ).join(
+            tiers, CreditorInquiry.id == tiers.c.inquiry_id
+        ).filter(
+            tiers.c.priority == best_priority
         ).order_by(
             CreditorInquiry.sent_at.desc()
-        ).all()
-
-        if exact_matches:
-            logger.debug("exact_email_match_found",
+        ).limit(self.max_candidates).all()
+
+        if candidates:
+            first_email = candidates[0].creditor_email_lc or ""
+            if first_email == sender_email_lc:
+                tier = "exact_email_match_found"
+            elif sender_domain and first_email.endswith(f"@{sender_domain}"):
+                tier = "domain_match_found"
+            else:
+                tier = "fallback_to_all_candidates"
+            logger.debug(tier,
                         from_email=from_email,
+                        domain=sender_domain,
                         kanzlei_id=self.kanzlei_id,
-                        count=len(exact_matches))
-            return exact_matches
+                        count=len(candidates))
 
-        # Second try: Domain match (same company, different email)
-        if sender_domain:
-            domain_matches = self.db.query(CreditorInquiry).filter(
-                and_(
-                    *base_filters,
-                    CreditorInquiry.creditor_email.ilike(f'%@{sender_domain}')
-                )
-            ).order_by(
-                CreditorInquiry.sent_at.desc()
-            ).all()
-
-            if domain_matches:
-                logger.debug("domain_match_found",
-                            from_email=from_email,
-                            domain=sender_domain,
-                            kanzlei_id=self.kanzlei_id,
-                            count=len(domain_matches))
-                return domain_matches
-
-        # Fallback: All inquiries in time window (scoped to kanzlei)
-        all_candidates = self.db.query(CreditorInquiry).filter(
-            and_(*base_filters)
-        ).order_by(
-            CreditorInquiry.sent_at.desc()
-        ).all()
+        return candidates
+
+    @staticmethod
+    def _rank_candidates(candidates: List[MatchCandidate]) -> List[MatchCandidate]:
+        """
+        Order candidates best-first, keeping only as many as _decide_match needs.
+
+        Small pools are simply sorted. Larger pools only select the top
+        RANK_TOP_K via heapq.nlargest (same order as a full sort), unless all
+        of those share the top creditor_email: gap dedup may then need to look
+        further down, so the full sorted list is returned.
+        """
+        def rank_key(candidate: MatchCandidate):
+            return (candidate.total_score, candidate.inquiry.sent_at or datetime.min)
 
-        logger.debug("fallback_to_all_candidates",
-                    from_email=from_email,
-                    kanzlei_id=self.kanzlei_id,
-                    count=len(all_candidates))
+        if len(candidates) <= RANK_FULL_SORT_MAX:
+            return sorted(candidates, key=rank_key, reverse=True)
 
-        return all_candidates
+        top = heapq.nlargest(RANK_TOP_K, candidates, key=rank_key)
+        top_email = top[0].inquiry.creditor_email_lc
+        if top_email and all(c.inquiry.creditor_email_lc == top_email for c in top[1:]):
+            return sorted(candidates, key=rank_key, reverse=True)
+        return top
 
     def _decide_match(
         self,
@@ -376,14 +430,14 @@ class MatchingEngineV2:
         # they represent the same creditor (duplicate inquiries) — skip to the
         # next *different* creditor for the gap calculation.
         second = candidates[1]
-        top_email = (top.inquiry.creditor_email or "").lower()
-        second_email = (second.inquiry.creditor_email or "").lower()
+        top_email = top.inquiry.creditor_email_lc or ""
+        second_email = second.inquiry.creditor_email_lc or ""
 
         if top_email and top_email == second_email:
             # Find the next candidate with a different creditor_email
             next_different = None
             for c in candidates[2:]:
-                c_email = (c.inquiry.creditor_email or "").lower()
+                c_email = c.inquiry.creditor_email_lc or ""
                 if c_email != top_email:
                     next_different = c
                     break
@@ -449,26 +503,31 @@ class MatchingEngineV2:
         Persist match results to database.
 
         Saves all candidates with their scoring_details JSONB for explainability.
+        All rows go out as one multi-row INSERT ... RETURNING, which also
+        populates IDs without a separate flush.
         """
-        match_results = []
-
-        for rank, candidate in enumerate(result.candidates, 1):
-            mr = MatchResult(
-                incoming_email_id=email_id,
-                creditor_inquiry_id=candidate.inquiry.id,
-                total_score=candidate.total_score,
-                confidence_level=candidate.confidence_level,
-                client_name_score=candidate.component_scores.get("client_name"),
-                reference_number_score=candidate.component_scores.get("reference"),
-                scoring_details=candidate.scoring_details,
-                rank=rank,
-                selected_as_match=(result.status == "auto_matched" and rank == 1),
-                selection_method=result.status
-            )
-            self.db.add(mr)
-            match_results.append(mr)
+        rows = [
+            {
+                "incoming_email_id": email_id,
+                "creditor_inquiry_id": candidate.inquiry.id,
+                "total_score": candidate.total_score,
+                "confidence_level": candidate.confidence_level,
+                "client_name_score": candidate.component_scores.get("client_name"),
+                "reference_number_score": candidate.component_scores.get("reference"),
+                "scoring_details": candidate.scoring_details,
+                "rank": rank,
+                "selected_as_match": (result.status == "auto_matched" and rank == 1),
+                "selection_method": result.status,
+            }
+            for rank, candidate in enumerate(result.candidates, 1)
+        ]
 
-        self.db.flush()  # Get IDs without committing
+        match_results = []
+        if rows:
+            match_results = list(self.db.scalars(
+                insert(MatchResult).returning(MatchResult, sort_by_parameter_order=True),
+                rows
+            ))
 
         logger.info("match_results_saved",
                    email_id=email_id,
@@ -5,11 +5,17 @@ Aggregates raw operational_metrics into operational_metrics_daily.
 USER DECISION: 30-day raw retention, then aggregate to daily summaries.
 
 Run daily at 01:30 to aggregate previous day's metrics.
+
+operational_metrics is range-partitioned by day on recorded_at
+(operational_metrics_pYYYYMMDD plus a DEFAULT partition). The job creates
+upcoming partitions ahead of time and retention drops whole expired
+partitions instead of deleting rows.
 """
 
-from datetime import date, timedelta
-from typing import Dict, List, Tuple
-from sqlalchemy import func, select, and_
+from datetime import date, datetime, time, timedelta
+from typing import Dict
+from sqlalchemy import Date, case, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 import logging
 
@@ -17,6 +23,17 @@ from app.models.operational_metrics import OperationalMetrics, OperationalMetric
 
 logger = logging.getLogger(__name__)
 
+# Rows deleted per statement during retention cleanup
+CLEANUP_BATCH_SIZE = 10000
+
+# Daily partitions of operational_metrics: name prefix and how many days
+# ahead the rollup job pre-creates them
+PARTITION_PREFIX = "operational_metrics_p"
+PARTITION_DAYS_AHEAD = 7
+
+# Label keys used as the rollup grouping key, most significant first
+LABEL_KEY_PRECEDENCE = ("actor", "queue", "model", "bucket")
+
 
 def extract_labels_key(labels: Dict) -> str:
     """
@@ -31,44 +48,54 @@ def extract_labels_key(labels: Dict) -> str:
     if not labels:
         return "all"
 
-    # Extract most significant label for grouping
-    if "actor" in labels:
-        return f"actor:{labels['actor']}"
-    elif "queue" in labels:
-        return f"queue:{labels['queue']}"
-    elif "model" in labels:
-        return f"model:{labels['model']}"
-    elif "bucket" in labels:
-        return f"bucket:{labels['bucket']}"
-    else:
-        # Use first key-value pair
-        key, value = next(iter(labels.items()))
-        return f"{key}:{value}"
-
-
-def calculate_percentile_95(values: List[float]) -> float:
-    """
-    Calculate 95th percentile of values.
+    # Most significant label wins (one dict lookup per candidate key)
+    for key in LABEL_KEY_PRECEDENCE:
+        value = labels.get(key)
+        if value is not None:
+            return f"{key}:{value}"
 
-    Args:
-        values: List of metric values
+    # Use first key-value pair
+    key, value = next(iter(labels.items()))
+    return f"{key}:{value}"
 
-    Returns:
-        95th percentile value
+
+def _labels_key_expr():
     """
-    if not values:
-        return 0.0
+    SQL expression computing the same grouping key as extract_labels_key.
 
-    sorted_values = sorted(values)
-    index = int(len(sorted_values) * 0.95)
-    return sorted_values[min(index, len(sorted_values) - 1)]
+    Keeps the LABEL_KEY_PRECEDENCE order, then the first pair, and
+    maps missing/empty labels to "all", so rollups built in SQL group
+    exactly like the Python helper.
+    """
+    labels = OperationalMetrics.labels
+
+    pairs = func.json_each_text(labels).table_valued("key", "value")
+    first_pair = select(
+        pairs.c.key + ":" + func.coalesce(pairs.c.value, "None")
+    ).limit(1).scalar_subquery()
+
+    return func.coalesce(
+        case(
+            (labels.is_(None), "all"),
+            (func.json_typeof(labels) != "object", "all"),
+            *[
+                (labels[key].astext.isnot(None), f"{key}:" + labels[key].astext)
+                for key in LABEL_KEY_PRECEDENCE
+            ],
+            else_=first_pair,
+        ),
+        "all",
+    )
 
 
 def aggregate_metrics_for_date(target_date: date, db: Session) -> int:
     """
     Aggregate raw metrics for given date into daily summaries.
 
-    Groups by (metric_type, labels_key) and calculates aggregates.
+    Groups by (metric_type, labels_key) and calculates aggregates. The whole
+    rollup runs in PostgreSQL as one INSERT ... SELECT ... GROUP BY with
+    ON CONFLICT DO UPDATE, so raw rows are never loaded into Python and
+    re-running the job for the same date overwrites the previous rollup.
 
     Args:
         target_date: Date to aggregate (typically yesterday)
@@ -79,104 +106,181 @@ def aggregate_metrics_for_date(target_date: date, db: Session) -> int:
     """
     logger.info(f"Starting operational metrics rollup for {target_date}")
 
-    # Query all raw metrics for target date
-    metrics = db.query(OperationalMetrics).filter(
-        func.date(OperationalMetrics.recorded_at) == target_date
-    ).all()
-
-    if not metrics:
-        logger.info(f"No operational metrics found for {target_date}")
-        return 0
-
-    # Group metrics by (metric_type, labels_key)
-    grouped: Dict[Tuple[str, str], List[float]] = {}
-
-    for metric in metrics:
-        labels_key = extract_labels_key(metric.labels)
-        key = (metric.metric_type, labels_key)
-
-        if key not in grouped:
-            grouped[key] = []
-        grouped[key].append(metric.metric_value)
-
-    # Create or update daily rollup records
-    aggregated_count = 0
-
-    for (metric_type, labels_key), values in grouped.items():
-        sample_count = len(values)
-        sum_value = sum(values)
-        avg_value = sum_value / sample_count
-        min_value = min(values)
-        max_value = max(values)
-        p95_value = calculate_percentile_95(values)
-
-        # Upsert daily rollup (update if exists, insert if not)
-        existing = db.query(OperationalMetricsDaily).filter(
-            and_(
-                OperationalMetricsDaily.metric_type == metric_type,
-                OperationalMetricsDaily.date == target_date,
-                OperationalMetricsDaily.labels_key == labels_key
-            )
-        ).first()
-
-        if existing:
-            # Update existing record
-            existing.sample_count = sample_count
-            existing.sum_value = sum_value
-            existing.avg_value = avg_value
-            existing.min_value = min_value
-            existing.max_value = max_value
-            existing.p95_value = p95_value
-        else:
-            # Create new record
-            rollup = OperationalMetricsDaily(
-                metric_type=metric_type,
-                date=target_date,
-                labels_key=labels_key,
-                sample_count=sample_count,
-                sum_value=sum_value,
-                avg_value=avg_value,
-                min_value=min_value,
-                max_value=max_value,
-                p95_value=p95_value
-            )
-            db.add(rollup)
+    # Derive labels_key per row first so the outer GROUP BY can reference a
+    # plain column instead of repeating the (parameterized) expression
+    raw = select(
+        OperationalMetrics.metric_type,
+        _labels_key_expr().label("labels_key"),
+        OperationalMetrics.metric_value,
+    ).where(
+        OperationalMetrics.recorded_at >= datetime.combine(target_date, time.min),
+        OperationalMetrics.recorded_at < datetime.combine(target_date + timedelta(days=1), time.min),
+    ).subquery()
+
+    value = raw.c.metric_value
+    grouped = select(
+        raw.c.metric_type,
+        literal(target_date, Date).label("date"),
+        raw.c.labels_key,
+        func.count().label("sample_count"),
+        func.sum(value).label("sum_value"),
+        func.avg(value).label("avg_value"),
+        func.min(value).label("min_value"),
+        func.max(value).label("max_value"),
+        func.percentile_cont(0.95).within_group(value).label("p95_value"),
+    ).group_by(
+        raw.c.metric_type,
+        raw.c.labels_key,
+    )
 
-        aggregated_count += 1
+    stmt = pg_insert(OperationalMetricsDaily).from_select(
+        [
+            "metric_type", "date", "labels_key", "sample_count", "sum_value",
+            "avg_value", "min_value", "max_value", "p95_value",
+        ],
+        grouped,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["metric_type", "date", "labels_key"],
+        set_={
+            "sample_count": stmt.excluded.sample_count,
+            "sum_value": stmt.excluded.sum_value,
+            "avg_value": stmt.excluded.avg_value,
+            "min_value": stmt.excluded.min_value,
+            "max_value": stmt.excluded.max_value,
+            "p95_value": stmt.excluded.p95_value,
+        },
+    )
 
+    aggregated_count = db.execute(stmt).rowcount
     db.commit()
 
+    if not aggregated_count:
+        logger.info(f"No operational metrics found for {target_date}")
+        return 0
+
     logger.info(
         f"Operational metrics rollup completed for {target_date}: "
-        f"{aggregated_count} metric groups aggregated from {len(metrics)} raw records"
+        f"{aggregated_count} metric groups aggregated"
     )
 
     return aggregated_count
 
 
+def _partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def ensure_metrics_partitions(db: Session, start: date, days_ahead: int = PARTITION_DAYS_AHEAD) -> int:
+    """
+    Create the daily operational_metrics partitions from start through start + days_ahead.
+
+    Existing partitions are left alone. A day whose rows already landed in
+    the DEFAULT partition cannot get its own partition; that is logged and
+    skipped (those rows are still aggregated and cleaned up normally).
+
+    Args:
+        db: Database session
+        start: First day to ensure a partition for
+        days_ahead: Additional days after start
+
+    Returns:
+        Number of days for which a partition now exists
+    """
+    ensured = 0
+    for offset in range(days_ahead + 1):
+        day = start + timedelta(days=offset)
+        try:
+            with db.begin_nested():
+                db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {_partition_name(day)} "
+                    f"PARTITION OF operational_metrics "
+                    f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+                ))
+            ensured += 1
+        except Exception as e:
+            logger.warning(f"Could not create operational metrics partition for {day}: {str(e)}")
+    db.commit()
+
+    return ensured
+
+
+def drop_expired_metric_partitions(db: Session, cutoff_date: date) -> int:
+    """
+    Drop daily operational_metrics partitions that lie entirely before cutoff_date.
+
+    Args:
+        db: Database session
+        cutoff_date: Partitions for days before this date are dropped
+
+    Returns:
+        Number of partitions dropped
+    """
+    partitions = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'operational_metrics'::regclass"
+    )).scalars().all()
+
+    expired_before = _partition_name(cutoff_date)
+    dropped = 0
+    for name in partitions:
+        suffix = name[len(PARTITION_PREFIX):]
+        # Names sort by day, so a string comparison finds the expired ones
+        if name.startswith(PARTITION_PREFIX) and len(suffix) == 8 and suffix.isdigit() \
+                and name < expired_before:
+            db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped += 1
+    db.commit()
+
+    return dropped
+
+
 def cleanup_old_raw_metrics(db: Session, retention_days: int = 30) -> int:
     """
     Delete raw metrics older than retention period.
 
     USER DECISION: 30-day raw retention (matches prompt metrics).
 
+    Expired daily partitions are dropped outright. Rows that remain before
+    the cutoff (DEFAULT partition) are then deleted in batches of
+    CLEANUP_BATCH_SIZE rows, committing after each, so a large backlog does
+    not hold long locks or produce one huge transaction.
+
     Args:
         db: Database session
         retention_days: Days to retain raw metrics (default 30)
 
     Returns:
-        Number of records deleted
+        Number of records deleted row-by-row (dropped partitions are logged
+        separately; counting their rows would defeat the point of dropping)
     """
     cutoff_date = date.today() - timedelta(days=retention_days)
+    cutoff = datetime.combine(cutoff_date, time.min)
 
-    deleted = db.query(OperationalMetrics).filter(
-        func.date(OperationalMetrics.recorded_at) < cutoff_date
-    ).delete(synchronize_session=False)
+    dropped = drop_expired_metric_partitions(db, cutoff_date)
 
-    db.commit()
+    deleted = 0
+    while True:
+        batch_ids = select(OperationalMetrics.id).where(
+            OperationalMetrics.recorded_at < cutoff
+        ).limit(CLEANUP_BATCH_SIZE).scalar_subquery()
+
+        batch_deleted = db.execute(
+            delete(OperationalMetrics).where(
+                OperationalMetrics.recorded_at < cutoff,
+                OperationalMetrics.id.in_(batch_ids),
+            )
+        ).rowcount
+        db.commit()
+
+        deleted += batch_deleted
+        if batch_deleted < CLEANUP_BATCH_SIZE:
+            break
 
     logger.info(
         f"Operational metrics cleanup completed: "
+        f"{dropped} partitions dropped, "
         f"{deleted} records deleted (older than {cutoff_date})"
     )
 
@@ -195,6 +299,9 @@ def run_operational_metrics_rollup(db: Session) -> None:
     yesterday = date.today() - timedelta(days=1)
 
     try:
+        # Make sure today and the coming days have partitions before rows arrive
+        ensure_metrics_partitions(db, date.today())
+
         # Aggregate yesterday's metrics
         aggregated = aggregate_metrics_for_date(yesterday, db)
 
@@ -217,5 +324,7 @@ def run_operational_metrics_rollup(db: Session) -> None:
 __all__ = [
     "aggregate_metrics_for_date",
     "cleanup_old_raw_metrics",
+    "ensure_metrics_partitions",
+    "drop_expired_metric_partitions",
     "run_operational_metrics_rollup",
 ]
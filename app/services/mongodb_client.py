@@ -3,21 +3,131 @@ MongoDB Client Service
 Updates creditor data in MongoDB when responses are received
 """
 
-from typing import Optional, Dict, Any
-from datetime import datetime
+import copy
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple
+from rapidfuzz import fuzz, utils
 import structlog
 from app.services.monitoring.circuit_breakers import get_mongodb_breaker, CircuitBreakerError
 
 logger = structlog.get_logger()
 
+# Case-insensitive German collation used for client name lookups. Queries only
+# use an index whose collation matches exactly, so indexes share this spec.
+GERMAN_CI_COLLATION = {'locale': 'de', 'strength': 2}
+
+# Fields the creditor update methods read from a client document; everything
+# else (documents, portal state) stays on the server
+CREDITOR_UPDATE_PROJECTION = {'_id': 1, 'aktenzeichen': 1, 'final_creditor_list': 1}
+
 # Import MongoDB client (pymongo)
 try:
-    from pymongo import MongoClient
+    from pymongo import MongoClient, UpdateOne
+    from pymongo.errors import BulkWriteError
+    from pymongo.read_preferences import SecondaryPreferred
     MONGODB_AVAILABLE = True
 except ImportError:
     MONGODB_AVAILABLE = False
     logger.warning("mongodb_unavailable", reason="pymongo_not_installed")
 
+# Creditor fields compared against the creditor name from the response
+CREDITOR_NAME_FIELDS = ('sender_name', 'glaeubiger_name', 'glaeubigervertreter_name', 'actual_creditor')
+
+# Minimum RapidFuzz token_set_ratio for a fuzzy creditor name match
+CREDITOR_NAME_SCORE_CUTOFF = 80
+
+# Free-mail providers: a shared domain there says nothing about the creditor
+FREEMAIL_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com",
+    "hotmail.com", "hotmail.de", "outlook.com", "outlook.de", "live.com", "live.de", "msn.com",
+    "yahoo.com", "yahoo.de",
+    "gmx.de", "gmx.net", "gmx.at", "gmx.ch",
+    "web.de",
+    "t-online.de",
+    "freenet.de",
+    "posteo.de", "posteo.net",
+    "mail.de", "email.de",
+    "aol.com",
+    "icloud.com", "me.com", "mac.com",
+    "protonmail.com", "proton.me",
+    "tutanota.com", "tuta.io",
+    "arcor.de",
+    "vodafone.de",
+    "1und1.de",
+})
+
+# Read-only client getters may be served by a secondary lagging at most this
+# long (90s is the server minimum); updaters keep reading from the primary
+GETTER_MAX_STALENESS_SECONDS = 90
+
+# Ticket/Aktenzeichen lookups are cached in-process: creditors of one client
+# tend to respond in bursts. Portal-side edits show up within one TTL window;
+# this service's own writes evict the client immediately.
+CLIENT_CACHE_TTL_SECONDS = 60.0
+CLIENT_CACHE_MAX_SIZE = 1024
+
+
+def match_creditor_name(search_name: str, cred: Dict[str, Any]) -> Optional[Tuple[str, str, float]]:
+    """
+    Check a final_creditor_list entry against a (lowercased, stripped) creditor name.
+
+    A field matches if either name contains the other, or if RapidFuzz
+    token_set_ratio reaches CREDITOR_NAME_SCORE_CUTOFF (tolerates extra words,
+    word order, typos and umlaut variants; exits early below the cutoff).
+
+    Returns:
+        (matched_field, method, score) for the first matching field, else None
+    """
+    for name_field in CREDITOR_NAME_FIELDS:
+        field_value = cred.get(name_field)
+        if not field_value:
+            continue
+        cred_name = field_value.lower().strip()
+
+        if (search_name in cred_name) or (cred_name in search_name):
+            return name_field, "substring", 100.0
+
+        score = fuzz.token_set_ratio(
+            search_name, cred_name,
+            processor=utils.default_process,
+            score_cutoff=CREDITOR_NAME_SCORE_CUTOFF
+        )
+        if score:
+            return name_field, "token_set_ratio", score
+
+    return None
+
+
+def creditor_update_filter(client: Dict[str, Any], idx: int) -> Dict[str, Any]:
+    """
+    Build the filter for a positional update of final_creditor_list.{idx}.
+
+    Besides the client _id, the filter pins the element at idx to the sender
+    that was matched when the client was read. If the portal reorders or edits
+    the list in between, the update matches nothing instead of writing into
+    another creditor's entry.
+    """
+    cred = client['final_creditor_list'][idx]
+    return {
+        '_id': client['_id'],
+        f'final_creditor_list.{idx}.sender_email': cred.get('sender_email'),
+        f'final_creditor_list.{idx}.sender_name': cred.get('sender_name'),
+    }
+
+
+def _creditor_filter_matches(client: Dict[str, Any], update_filter: Dict[str, Any]) -> bool:
+    """Evaluate a creditor_update_filter's pinned creditor fields against a client document."""
+    creditors = client.get('final_creditor_list') or []
+    for path, expected in update_filter.items():
+        if path == '_id':
+            continue
+        _, idx, field = path.split('.')
+        idx = int(idx)
+        if idx >= len(creditors) or creditors[idx].get(field) != expected:
+            return False
+    return True
+
 
 class MongoDBService:
     """
@@ -31,6 +141,14 @@ class MongoDBService:
         self.mongodb_url = None
         self.mongodb_database = None
         self._initialized = False
+        # Resolved once on connect instead of per operation
+        self._clients = None
+        self._clients_read = None
+        self._breaker = None
+        # (lookup, value, projection) -> (expires_at, client document)
+        self._client_cache: Dict[Tuple[Any, ...], Tuple[float, Dict[str, Any]]] = {}
+        # The service is a module-level singleton shared by all worker threads
+        self._client_cache_lock = threading.Lock()
 
     def _lazy_init(self):
         """Lazy initialization to ensure settings are loaded"""
@@ -55,12 +173,27 @@ class MongoDBService:
 
         try:
             # Connect with SSL verification disabled for development (MongoDB Atlas)
+            # Pool/timeouts are explicit so one stuck socket cannot hang a worker;
+            # retryable reads/writes absorb Atlas failovers before the breaker trips
             self.client = MongoClient(
                 self.mongodb_url,
                 tlsAllowInvalidCertificates=True,
-                serverSelectionTimeoutMS=10000
+                serverSelectionTimeoutMS=10000,
+                connectTimeoutMS=5000,
+                socketTimeoutMS=settings.mongodb_socket_timeout_ms,
+                maxPoolSize=settings.mongodb_max_pool_size,
+                minPoolSize=settings.mongodb_min_pool_size,
+                retryWrites=True,
+                retryReads=True,
+                compressors='zlib',
+                appname='creditor-email-matcher'
             )
             self.db = self.client[self.mongodb_database]
+            self._clients = self.db['clients']
+            self._clients_read = self._clients.with_options(
+                read_preference=SecondaryPreferred(max_staleness=GETTER_MAX_STALENESS_SECONDS)
+            )
+            self._breaker = get_mongodb_breaker()
             # Test connection
             self.client.admin.command('ping')
             logger.info("mongodb_connected", database=self.mongodb_database)
@@ -68,6 +201,38 @@ class MongoDBService:
             logger.error("mongodb_connection_failed", error=str(e))
             self.client = None
             self.db = None
+            self._clients = None
+            return
+
+        self._ensure_indexes()
+
+    def _ensure_indexes(self):
+        """
+        Create the indexes our client lookups rely on (idempotent).
+
+        The clients collection is owned by the Node.js portal; failures here
+        are logged and never block the connection.
+        """
+        clients_collection = self._clients
+        indexes = [
+            # Case-insensitive first/last name lookup (collation equality)
+            ([('firstName', 1), ('lastName', 1)],
+             {'name': 'firstName_1_lastName_1_de_ci', 'collation': GERMAN_CI_COLLATION}),
+            # Single-token names are matched against lastName via $or
+            ([('lastName', 1)],
+             {'name': 'lastName_1_de_ci', 'collation': GERMAN_CI_COLLATION}),
+            # Primary client lookup (not unique: uniqueness is the portal's call)
+            ([('aktenzeichen', 1)], {'name': 'aktenzeichen_1'}),
+            # get_client_by_ticket $or: one index per branch so both are seeks
+            ([('zendesk_ticket_id', 1)], {'name': 'zendesk_ticket_id_1', 'sparse': True}),
+            ([('final_creditor_list.main_zendesk_ticket_id', 1)],
+             {'name': 'final_creditor_list.main_zendesk_ticket_id_1', 'sparse': True}),
+        ]
+        for keys, options in indexes:
+            try:
+                clients_collection.create_index(keys, **options)
+            except Exception as e:
+                logger.warning("mongodb_index_create_failed", index=options['name'], error=str(e))
 
     def is_available(self) -> bool:
         """Check if MongoDB is available"""
@@ -106,245 +271,42 @@ class MongoDBService:
             return False
 
         try:
-            clients_collection = self.db['clients']
-
-            # Step 1: Find the client
-            # Try by aktenzeichen first, then by name
-            client = None
-
-            if client_aktenzeichen:
-                client = clients_collection.find_one({'aktenzeichen': client_aktenzeichen})
-                if client:
-                    logger.info("client_found", method="aktenzeichen", aktenzeichen=client_aktenzeichen)
-
-                # Handle slash/underscore mismatch: Node.js sanitizeAktenzeichen
-                # replaces "/" with "_", but Python extracts "2007/255" from emails
-                if not client and '/' in client_aktenzeichen:
-                    normalized_az = client_aktenzeichen.replace('/', '_')
-                    client = clients_collection.find_one({'aktenzeichen': normalized_az})
-                    if client:
-                        logger.info("client_found", method="aktenzeichen_normalized",
-                                    original=client_aktenzeichen, normalized=normalized_az)
-
-            if not client and client_name:
-                # Try to split name into first and last
-                # Handle "LastName, FirstName" format (common in German documents)
-                name_to_parse = client_name.strip()
-                if ',' in name_to_parse:
-                    # "Stockhöfer, Tobias" → first_name="Tobias", last_name="Stockhöfer"
-                    parts = [p.strip() for p in name_to_parse.split(',', 1)]
-                    if len(parts) == 2:
-                        last_name, first_name = parts[0], parts[1]
-                        logger.info("name_format_detected", format="LastName, FirstName",
-                                   first_name=first_name, last_name=last_name)
-                    else:
-                        name_parts = name_to_parse.split(None, 1)
-                        first_name, last_name = (name_parts[0], name_parts[1]) if len(name_parts) == 2 else (name_to_parse, "")
-                else:
-                    # Standard "FirstName LastName" format
-                    name_parts = name_to_parse.split(None, 1)
-                    first_name, last_name = (name_parts[0], name_parts[1]) if len(name_parts) == 2 else (name_to_parse, "")
-
-                if first_name and last_name:
-                    # Try exact match first (handles umlauts correctly)
-                    client = clients_collection.find_one({
-                        'firstName': first_name,
-                        'lastName': last_name
-                    })
-
-                    # If not found, try case-insensitive with collation (works with umlauts)
-                    if not client:
-                        client = clients_collection.find_one(
-                            {
-                                'firstName': first_name,
-                                'lastName': last_name
-                            },
-                            collation={'locale': 'de', 'strength': 2}  # Case-insensitive for German
-                        )
-
-                    if client:
-                        logger.info("client_found", method="name", client_name=client_name)
-                else:
-                    # Try full name match in either field using collation for umlauts
-                    client = clients_collection.find_one(
-                        {
-                            '$or': [
-                                {'firstName': client_name},
-                                {'lastName': client_name}
-                            ]
-                        },
-                        collation={'locale': 'de', 'strength': 2}
-                    )
-                    if client:
-                        logger.info("client_found", method="partial_name", client_name=client_name)
-
-            if not client:
-                logger.warning("client_not_found", client_name=client_name, aktenzeichen=client_aktenzeichen)
-                return False
-
-            # Step 2: Find the creditor in final_creditor_list
-            creditors = client.get('final_creditor_list', [])
-            matched_creditor_index = None
-
-            # Fast path: if we know the exact position from deterministic routing, use it directly
-            if creditor_position is not None and 0 <= creditor_position < len(creditors):
-                matched_creditor_index = creditor_position
-                logger.info("creditor_matched_by_position",
-                           position=creditor_position,
-                           creditor_name=creditors[creditor_position].get('sender_name') or creditors[creditor_position].get('glaeubiger_name'))
-            else:
-                # Fallback: match by email or name
-
-                # Check test_mode from portal settings in MongoDB (review_settings collection)
-                test_mode = False
-                try:
-                    review_settings = self.db.review_settings.find_one({})
-                    if review_settings:
-                        test_mode = review_settings.get('test_mode_enabled', False)
-                except Exception:
-                    pass  # Fall back to normal matching if settings unavailable
-
-                for idx, cred in enumerate(creditors):
-                    # Match by email (primary) or name (fallback with fuzzy matching)
-                    email_match = False
-                    name_match = False
-
-                    # Email matching (exact, contains, or domain match)
-                    # In test_mode, skip email matching entirely — match by name only
-                    if test_mode:
-                        logger.info("test_mode_email_match_skipped",
-                                   creditor_email=creditor_email,
-                                   cred_email=cred.get('sender_email'))
-                    elif creditor_email and cred.get('sender_email'):
-                        cred_email = cred.get('sender_email', '').lower().strip()
-                        search_email = creditor_email.lower().strip()
-
-                        # Strategy 1: Check if either contains the other (handles partial matches)
-                        email_match = (search_email in cred_email) or (cred_email in search_email)
-
-                        # Strategy 2: Domain matching (same company, different email address)
-                        FREEMAIL_DOMAINS = {
-                            "gmail.com", "googlemail.com",
-                            "hotmail.com", "hotmail.de", "outlook.com", "outlook.de", "live.com", "live.de", "msn.com",
-                            "yahoo.com", "yahoo.de",
-                            "gmx.de", "gmx.net", "gmx.at", "gmx.ch",
-                            "web.de",
-                            "t-online.de",
-                            "freenet.de",
-                            "posteo.de", "posteo.net",
-                            "mail.de", "email.de",
-                            "aol.com",
-                            "icloud.com", "me.com", "mac.com",
-                            "protonmail.com", "proton.me",
-                            "tutanota.com", "tuta.io",
-                            "arcor.de",
-                            "vodafone.de",
-                            "1und1.de",
-                        }
-                        if not email_match and '@' in cred_email and '@' in search_email:
-                            cred_domain = cred_email.split('@')[-1]
-                            search_domain = search_email.split('@')[-1]
-                            if cred_domain == search_domain and cred_domain not in FREEMAIL_DOMAINS:
-                                email_match = True
-                                logger.info("domain_match",
-                                           cred_email=cred_email,
-                                           search_email=search_email,
-                                           domain=cred_domain)
-                            elif cred_domain == search_domain and cred_domain in FREEMAIL_DOMAINS:
-                                logger.debug("domain_match_skipped_freemail",
-                                            cred_email=cred_email,
-                                            search_email=search_email,
-                                            domain=cred_domain)
-
-                    # Name matching (fuzzy - check if words overlap)
-                    if creditor_name:
-                        search_name = creditor_name.lower().strip()
-                        search_words = set(word for word in search_name.split() if len(word) > 3)
-
-                        name_fields = [
-                            'sender_name',
-                            'glaeubiger_name',
-                            'glaeubigervertreter_name',
-                            'actual_creditor',
-                        ]
-
-                        for name_field in name_fields:
-                            if name_match:
-                                break
-                            field_value = cred.get(name_field)
-                            if not field_value:
-                                continue
-                            cred_name = field_value.lower().strip()
-                            cred_words = set(word for word in cred_name.split() if len(word) > 3)
-
-                            # Check if any significant words match
-                            if cred_words and search_words:
-                                common_words = cred_words & search_words
-                                if common_words:
-                                    name_match = True
-                                    logger.info("fuzzy_name_match",
-                                               matched_field=name_field,
-                                               common_words=list(common_words))
-
-                            # Also check if one name contains the other
-                            if not name_match:
-                                if (search_name in cred_name) or (cred_name in search_name):
-                                    name_match = True
-                                    logger.info("substring_name_match",
-                                               matched_field=name_field,
-                                               search_name=search_name,
-                                               cred_name=cred_name)
-
-                    if email_match or name_match:
-                        matched_creditor_index = idx
-                        logger.info("creditor_matched",
-                                   sender_name=cred.get('sender_name'),
-                                   glaeubiger_name=cred.get('glaeubiger_name'),
-                                   email_match=email_match,
-                                   name_match=name_match)
-                        break
-
-            if matched_creditor_index is None:
-                logger.warning("creditor_not_found",
-                              creditor_email=creditor_email,
-                              creditor_name=creditor_name)
+            clients_collection = self._clients
+
+            resolved = self._build_debt_update(
+                client_name=client_name,
+                client_aktenzeichen=client_aktenzeichen,
+                creditor_email=creditor_email,
+                creditor_name=creditor_name,
+                new_debt_amount=new_debt_amount,
+                response_text=response_text,
+                reference_numbers=reference_numbers,
+                extraction_confidence=extraction_confidence,
+                creditor_position=creditor_position
+            )
+            if resolved is None:
                 return False
-
-            # Step 3: Build update data
-            # NOTE: We set current_debt_amount (new from response), NOT claim_amount (original from document).
-            # claim_amount is the original debt from the Forderungsaufstellung and must never be overwritten.
-            idx = matched_creditor_index
-            update_data = {
-                f'final_creditor_list.{idx}.current_debt_amount': new_debt_amount,
-                f'final_creditor_list.{idx}.creditor_response_amount': new_debt_amount,
-                f'final_creditor_list.{idx}.amount_source': 'creditor_response',
-                f'final_creditor_list.{idx}.response_received_at': datetime.utcnow(),
-                f'final_creditor_list.{idx}.contact_status': 'responded',
-                f'final_creditor_list.{idx}.last_contacted_at': datetime.utcnow()
-            }
-
-            if extraction_confidence is not None:
-                update_data[f'final_creditor_list.{idx}.extraction_confidence'] = extraction_confidence
-
-            if response_text:
-                update_data[f'final_creditor_list.{idx}.creditor_response_text'] = response_text
-
-            if reference_numbers:
-                update_data[f'final_creditor_list.{idx}.response_reference_numbers'] = reference_numbers
+            client, update_filter, update = resolved
 
             # Step 4: Update MongoDB with circuit breaker
-            breaker = get_mongodb_breaker()
+            breaker = self._breaker
             try:
                 result = breaker.call(
                     clients_collection.update_one,
-                    {'_id': client['_id']},
-                    {'$set': update_data}
+                    update_filter,
+                    update
                 )
             except CircuitBreakerError:
                 logger.error("mongodb_circuit_open", client_name=client_name)
                 raise  # Let caller handle retry
 
+            if result.matched_count == 0:
+                logger.warning("mongodb_creditor_list_changed",
+                              aktenzeichen=client.get('aktenzeichen'),
+                              creditor_name=creditor_name)
+                return False
             if result.modified_count > 0:
+                self._evict_cached_client(client['_id'])
                 logger.info("mongodb_updated",
                            aktenzeichen=client.get('aktenzeichen'),
                            creditor_name=creditor_name,
@@ -355,15 +317,384 @@ class MongoDBService:
                 return False
 
         except Exception as e:
-            logger.error("mongodb_update_error", error=str(e), exc_info=True)
+            logger.error("mongodb_update_error", error=str(e))
+            # Traceback only at DEBUG: error storms must not be dominated by formatting
+            logger.debug("mongodb_update_error_trace", exc_info=True)
             return False
 
-    def get_client_by_ticket(self, zendesk_ticket_id: str) -> Optional[Dict[str, Any]]:
+    def update_creditor_debt_amounts_bulk(self, updates: List[Dict[str, Any]]) -> List[bool]:
         """
-        Get client document by Zendesk ticket ID
+        Apply many debt amount updates with a single bulk_write round-trip.
+
+        Each entry holds the keyword arguments of update_creditor_debt_amount.
+        Clients and creditors are resolved per entry exactly as there; all
+        resolved updates are then sent as one unordered bulk_write.
+
+        Args:
+            updates: List of update_creditor_debt_amount keyword argument dicts
+
+        Returns:
+            Per-entry success flags, in input order
+
+        Raises:
+            CircuitBreakerError: If the MongoDB circuit is open (caller retries)
+        """
+        results = [False] * len(updates)
+        if not updates:
+            return results
+        if not self.is_available():
+            logger.warning("mongodb_update_skipped", reason="not_available", count=len(updates))
+            return results
+
+        operations = []
+        operation_entries = []  # operation position -> index into updates
+        written_client_ids = []
+        for entry_index, update in enumerate(updates):
+            try:
+                resolved = self._build_debt_update(**update)
+            except Exception as e:
+                logger.error("mongodb_update_error", error=str(e))
+                logger.debug("mongodb_update_error_trace", exc_info=True)
+                continue
+            if resolved is None:
+                continue
+            client, update_filter, update = resolved
+            operations.append((update_filter, update))
+            operation_entries.append(entry_index)
+            written_client_ids.append(client['_id'])
+
+        if not operations:
+            return results
+
+        failed_operations = set()
+        try:
+            result = self._breaker.call(
+                self._clients.bulk_write,
+                [UpdateOne(update_filter, update) for update_filter, update in operations],
+                ordered=False
+            )
+            matched_count = result.matched_count
+        except CircuitBreakerError:
+            logger.error("mongodb_circuit_open", operation="update_creditor_debt_amounts_bulk")
+            raise
+        except BulkWriteError as e:
+            failed_operations = {error['index'] for error in e.details.get('writeErrors', [])}
+            matched_count = e.details.get('nMatched', 0)
+            logger.error("mongodb_bulk_update_partial_failure",
+                        failed=len(failed_operations),
+                        total=len(operations))
+        except Exception as e:
+            logger.error("mongodb_bulk_update_error", error=str(e))
+            logger.debug("mongodb_bulk_update_error_trace", exc_info=True)
+            return results
+
+        for client_id in written_client_ids:
+            self._evict_cached_client(client_id)
+
+        # A filter that matches nothing (creditor list reordered/edited since it
+        # was read) is not a write error, so the bulk result only tells us how
+        # many missed, not which. One read of the affected clients finds them.
+        if matched_count < len(operations) - len(failed_operations):
+            failed_operations |= self._find_unmatched_updates(operations, failed_operations)
+
+        for position, entry_index in enumerate(operation_entries):
+            results[entry_index] = position not in failed_operations
+
+        logger.info("mongodb_bulk_updated",
+                   requested=len(updates),
+                   written=sum(results))
+        return results
+
+    def _find_unmatched_updates(
+        self,
+        operations: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+        skip: set
+    ) -> set:
+        """
+        Return the positions of bulk debt updates whose filter matches no document.
+
+        Reads the affected clients once (final_creditor_list only) and checks
+        each pinned creditor_update_filter in Python; nothing is re-written.
+        If the read fails, every unverified update counts as unmatched so the
+        caller retries it.
+        """
+        pending = [position for position in range(len(operations)) if position not in skip]
+        client_ids = list({operations[position][0]['_id'] for position in pending})
+        try:
+            documents = self._breaker.call(
+                self._clients.find,
+                {'_id': {'$in': client_ids}},
+                {'final_creditor_list': 1}
+            )
+            clients = {document['_id']: document for document in documents}
+        except Exception as e:
+            logger.error("mongodb_update_error", error=str(e))
+            logger.debug("mongodb_update_error_trace", exc_info=True)
+            return set(pending)
+
+        unmatched = set()
+        for position in pending:
+            update_filter = operations[position][0]
+            client = clients.get(update_filter['_id'])
+            if client is None or not _creditor_filter_matches(client, update_filter):
+                logger.warning("mongodb_creditor_list_changed", client_id=str(update_filter['_id']))
+                unmatched.add(position)
+        return unmatched
+
+    def _build_debt_update(
+        self,
+        client_name: str,
+        client_aktenzeichen: Optional[str],
+        creditor_email: str,
+        creditor_name: str,
+        new_debt_amount: float,
+        response_text: Optional[str] = None,
+        reference_numbers: Optional[list] = None,
+        extraction_confidence: Optional[float] = None,
+        creditor_position: Optional[int] = None
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+        """
+        Find the client and creditor for a debt update and build its update document.
+
+        Returns:
+            (client document, update filter, update document) or None if
+            client/creditor not found
+        """
+        clients_collection = self._clients
+
+        # Step 1: Find the client
+        # Try by aktenzeichen first, then by name
+        client = None
+
+        if client_aktenzeichen:
+            client = clients_collection.find_one({'aktenzeichen': client_aktenzeichen}, CREDITOR_UPDATE_PROJECTION)
+            if client:
+                logger.info("client_found", method="aktenzeichen", aktenzeichen=client_aktenzeichen)
+
+            # Handle slash/underscore mismatch: Node.js sanitizeAktenzeichen
+            # replaces "/" with "_", but Python extracts "2007/255" from emails
+            if not client and '/' in client_aktenzeichen:
+                normalized_az = client_aktenzeichen.replace('/', '_')
+                client = clients_collection.find_one({'aktenzeichen': normalized_az}, CREDITOR_UPDATE_PROJECTION)
+                if client:
+                    logger.info("client_found", method="aktenzeichen_normalized",
+                                original=client_aktenzeichen, normalized=normalized_az)
+
+        if not client and client_name:
+            # Try to split name into first and last
+            # Handle "LastName, FirstName" format (common in German documents)
+            name_to_parse = client_name.strip()
+            if ',' in name_to_parse:
+                # "Stockhöfer, Tobias" → first_name="Tobias", last_name="Stockhöfer"
+                parts = [p.strip() for p in name_to_parse.split(',', 1)]
+                if len(parts) == 2:
+                    last_name, first_name = parts[0], parts[1]
+                    logger.info("name_format_detected", format="LastName, FirstName",
+                               first_name=first_name, last_name=last_name)
+                else:
+                    name_parts = name_to_parse.split(None, 1)
+                    first_name, last_name = (name_parts[0], name_parts[1]) if len(name_parts) == 2 else (name_to_parse, "")
+            else:
+                # Standard "FirstName LastName" format
+                name_parts = name_to_parse.split(None, 1)
+                first_name, last_name = (name_parts[0], name_parts[1]) if len(name_parts) == 2 else (name_to_parse, "")
+
+            if first_name and last_name:
+                # Case-insensitive with collation (works with umlauts); also
+                # covers exact-case input and uses the collated name index
+                client = clients_collection.find_one(
+                    {
+                        'firstName': first_name,
+                        'lastName': last_name
+                    },
+                    CREDITOR_UPDATE_PROJECTION,
+                    collation=GERMAN_CI_COLLATION  # Case-insensitive for German
+                )
+
+                if client:
+                    logger.info("client_found", method="name", client_name=client_name)
+            else:
+                # Try full name match in either field using collation for umlauts
+                client = clients_collection.find_one(
+                    {
+                        '$or': [
+                            {'firstName': client_name},
+                            {'lastName': client_name}
+                        ]
+                    },
+                    CREDITOR_UPDATE_PROJECTION,
+                    collation=GERMAN_CI_COLLATION
+                )
+                if client:
+                    logger.info("client_found", method="partial_name", client_name=client_name)
+
+        if not client:
+            logger.warning("client_not_found", client_name=client_name, aktenzeichen=client_aktenzeichen)
+            return None
+
+        # Step 2: Find the creditor in final_creditor_list
+        creditors = client.get('final_creditor_list', [])
+        matched_creditor_index = None
+
+        # Fast path: if we know the exact position from deterministic routing, use it directly
+        if creditor_position is not None and 0 <= creditor_position < len(creditors):
+            matched_creditor_index = creditor_position
+            logger.info("creditor_matched_by_position",
+                       position=creditor_position,
+                       creditor_name=creditors[creditor_position].get('sender_name') or creditors[creditor_position].get('glaeubiger_name'))
+        else:
+            # Fallback: match by email or name
+
+            # Check test_mode from portal settings in MongoDB (review_settings collection)
+            test_mode = False
+            try:
+                review_settings = self.db.review_settings.find_one({}, {'test_mode_enabled': 1})
+                if review_settings:
+                    test_mode = review_settings.get('test_mode_enabled', False)
+            except Exception:
+                pass  # Fall back to normal matching if settings unavailable
+
+            # The search side is the same for every creditor: normalize it once
+            search_email = (creditor_email or '').lower().strip()
+            search_domain = search_email.split('@')[-1] if '@' in search_email else None
+            search_name = (creditor_name or '').lower().strip()
+
+            for idx, cred in enumerate(creditors):
+                # Match by email (primary) or name (fallback with fuzzy matching)
+                email_match = False
+                name_match = False
+
+                # Email matching (exact, contains, or domain match)
+                # In test_mode, skip email matching entirely — match by name only
+                if test_mode:
+                    logger.info("test_mode_email_match_skipped",
+                               creditor_email=creditor_email,
+                               cred_email=cred.get('sender_email'))
+                elif creditor_email and cred.get('sender_email'):
+                    cred_email = cred.get('sender_email', '').lower().strip()
+
+                    # Strategy 1: Check if either contains the other (handles partial matches)
+                    email_match = (search_email in cred_email) or (cred_email in search_email)
+
+                    # Strategy 2: Domain matching (same company, different email address)
+                    if not email_match and '@' in cred_email and search_domain is not None:
+                        cred_domain = cred_email.split('@')[-1]
+                        if cred_domain == search_domain and cred_domain not in FREEMAIL_DOMAINS:
+                            email_match = True
+                            logger.info("domain_match",
+                                       cred_email=cred_email,
+                                       search_email=search_email,
+                                       domain=cred_domain)
+                        elif cred_domain == search_domain and cred_domain in FREEMAIL_DOMAINS:
+                            logger.debug("domain_match_skipped_freemail",
+                                        cred_email=cred_email,
+                                        search_email=search_email,
+                                        domain=cred_domain)
+
+                # Name matching (substring or RapidFuzz token set similarity);
+                # skipped once the email matched, it cannot change the outcome
+                if creditor_name and not email_match:
+                    name_match_result = match_creditor_name(search_name, cred)
+                    if name_match_result:
+                        name_match = True
+                        matched_field, method, score = name_match_result
+                        logger.info("fuzzy_name_match" if method == "token_set_ratio" else "substring_name_match",
+                                   matched_field=matched_field,
+                                   method=method,
+                                   score=score)
+
+                if email_match or name_match:
+                    matched_creditor_index = idx
+                    logger.info("creditor_matched",
+                               sender_name=cred.get('sender_name'),
+                               glaeubiger_name=cred.get('glaeubiger_name'),
+                               email_match=email_match,
+                               name_match=name_match)
+                    break
+
+        if matched_creditor_index is None:
+            logger.warning("creditor_not_found",
+                          creditor_email=creditor_email,
+                          creditor_name=creditor_name)
+            return None
+
+        # Step 3: Build update data
+        # NOTE: We set current_debt_amount (new from response), NOT claim_amount (original from document).
+        # claim_amount is the original debt from the Forderungsaufstellung and must never be overwritten.
+        idx = matched_creditor_index
+        update_data = {
+            f'final_creditor_list.{idx}.current_debt_amount': new_debt_amount,
+            f'final_creditor_list.{idx}.creditor_response_amount': new_debt_amount,
+            f'final_creditor_list.{idx}.amount_source': 'creditor_response',
+            f'final_creditor_list.{idx}.contact_status': 'responded',
+        }
+
+        if extraction_confidence is not None:
+            update_data[f'final_creditor_list.{idx}.extraction_confidence'] = extraction_confidence
+
+        if response_text:
+            update_data[f'final_creditor_list.{idx}.creditor_response_text'] = response_text
+
+        if reference_numbers:
+            update_data[f'final_creditor_list.{idx}.response_reference_numbers'] = reference_numbers
+
+        # Timestamps come from the server clock, one value for both fields
+        update = {
+            '$set': update_data,
+            '$currentDate': {
+                f'final_creditor_list.{idx}.response_received_at': True,
+                f'final_creditor_list.{idx}.last_contacted_at': True,
+            },
+        }
+        return client, creditor_update_filter(client, idx), update
+
+    @staticmethod
+    def _client_cache_key(lookup: str, value: str, projection: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+        return (lookup, value, tuple(sorted(projection.items())) if projection else None)
+
+    def _client_cache_get(self, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        with self._client_cache_lock:
+            entry = self._client_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, client = entry
+            if expires_at < time.monotonic():
+                self._client_cache.pop(key, None)
+                return None
+        # Callers may mutate the returned document; never hand out the cached instance
+        return copy.deepcopy(client)
+
+    def _client_cache_set(self, key: Tuple[Any, ...], client: Dict[str, Any]) -> None:
+        entry = (time.monotonic() + CLIENT_CACHE_TTL_SECONDS, copy.deepcopy(client))
+        with self._client_cache_lock:
+            if len(self._client_cache) >= CLIENT_CACHE_MAX_SIZE:
+                # Dicts keep insertion order: evict the oldest entry
+                self._client_cache.pop(next(iter(self._client_cache)), None)
+            self._client_cache[key] = entry
+
+    def _evict_cached_client(self, client_id: Any) -> None:
+        """Drop every cached lookup of a client after this service wrote to it."""
+        with self._client_cache_lock:
+            stale = [key for key, (_, client) in self._client_cache.items() if client.get('_id') == client_id]
+            for key in stale:
+                del self._client_cache[key]
+
+    def clear_client_cache(self) -> None:
+        """Drop all cached client lookups."""
+        with self._client_cache_lock:
+            self._client_cache.clear()
+
+    def get_client_by_ticket(
+        self,
+        zendesk_ticket_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get client document by Zendesk ticket ID (cached for CLIENT_CACHE_TTL_SECONDS)
 
         Args:
             zendesk_ticket_id: Main Zendesk ticket ID
+            projection: Optional MongoDB projection (default: whole document)
 
         Returns:
             Client document or None
@@ -371,11 +702,16 @@ class MongoDBService:
         if not self.is_available():
             return None
 
+        cache_key = self._client_cache_key('ticket', zendesk_ticket_id, projection)
+        cached = self._client_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            clients_collection = self.db['clients']
+            clients_collection = self._clients_read
 
             # Search in both top-level zendesk_ticket_id and in final_creditor_list
-            breaker = get_mongodb_breaker()
+            breaker = self._breaker
             try:
                 client = breaker.call(
                     clients_collection.find_one,
@@ -384,24 +720,32 @@ class MongoDBService:
                             {'zendesk_ticket_id': zendesk_ticket_id},
                             {'final_creditor_list.main_zendesk_ticket_id': zendesk_ticket_id}
                         ]
-                    }
+                    },
+                    projection
                 )
             except CircuitBreakerError:
                 logger.error("mongodb_circuit_open", operation="get_client_by_ticket")
                 raise
 
+            if client:
+                self._client_cache_set(cache_key, client)
             return client
 
         except Exception as e:
             logger.error("get_client_by_ticket_error", error=str(e))
             return None
 
-    def get_client_by_aktenzeichen(self, aktenzeichen: str) -> Optional[Dict[str, Any]]:
+    def get_client_by_aktenzeichen(
+        self,
+        aktenzeichen: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
-        Get client document by Aktenzeichen (case number)
+        Get client document by Aktenzeichen (case number, cached for CLIENT_CACHE_TTL_SECONDS)
 
         Args:
             aktenzeichen: Client case number (e.g., "1381_25")
+            projection: Optional MongoDB projection (default: whole document)
 
         Returns:
             Client document or None
@@ -409,20 +753,27 @@ class MongoDBService:
         if not self.is_available():
             return None
 
+        cache_key = self._client_cache_key('aktenzeichen', aktenzeichen, projection)
+        cached = self._client_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            clients_collection = self.db['clients']
-            breaker = get_mongodb_breaker()
+            clients_collection = self._clients_read
+            breaker = self._breaker
             try:
                 client = breaker.call(
                     clients_collection.find_one,
-                    {'aktenzeichen': aktenzeichen}
+                    {'aktenzeichen': aktenzeichen},
+                    projection
                 )
                 # Handle slash/underscore mismatch (sanitizeAktenzeichen in Node.js)
                 if not client and '/' in aktenzeichen:
                     normalized = aktenzeichen.replace('/', '_')
                     client = breaker.call(
                         clients_collection.find_one,
-                        {'aktenzeichen': normalized}
+                        {'aktenzeichen': normalized},
+                        projection
                     )
                     if client:
                         logger.info("client_found", method="aktenzeichen_normalized",
@@ -430,19 +781,27 @@ class MongoDBService:
             except CircuitBreakerError:
                 logger.error("mongodb_circuit_open", operation="get_client_by_aktenzeichen")
                 raise
+            if client:
+                self._client_cache_set(cache_key, client)
             return client
 
         except Exception as e:
             logger.error("get_client_by_aktenzeichen_error", error=str(e))
             return None
 
-    def get_client_by_name(self, first_name: str, last_name: str) -> Optional[Dict[str, Any]]:
+    def get_client_by_name(
+        self,
+        first_name: str,
+        last_name: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Get client document by name (case-insensitive)
 
         Args:
             first_name: Client's first name
             last_name: Client's last name
+            projection: Optional MongoDB projection (default: whole document)
 
         Returns:
             Client document or None
@@ -451,22 +810,19 @@ class MongoDBService:
             return None
 
         try:
-            clients_collection = self.db['clients']
+            clients_collection = self._clients_read
 
             # Case-insensitive search with collation (works with umlauts)
-            breaker = get_mongodb_breaker()
+            breaker = self._breaker
             try:
-                # Try exact match first, then with German collation
+                # Collated lookup only: it also matches exact-case input, and
+                # only a collated query can use the firstName/lastName index
                 client = breaker.call(
                     clients_collection.find_one,
-                    {'firstName': first_name, 'lastName': last_name}
+                    {'firstName': first_name, 'lastName': last_name},
+                    projection,
+                    collation=GERMAN_CI_COLLATION
                 )
-                if not client:
-                    client = breaker.call(
-                        clients_collection.find_one,
-                        {'firstName': first_name, 'lastName': last_name},
-                        collation={'locale': 'de', 'strength': 2}
-                    )
             except CircuitBreakerError:
                 logger.error("mongodb_circuit_open", operation="get_client_by_name")
                 raise
@@ -500,15 +856,15 @@ class MongoDBService:
             return False
 
         try:
-            clients_collection = self.db['clients']
+            clients_collection = self._clients
 
             # --- Client lookup (same logic as update_creditor_debt_amount) ---
             client = None
             if client_aktenzeichen:
-                client = clients_collection.find_one({'aktenzeichen': client_aktenzeichen})
+                client = clients_collection.find_one({'aktenzeichen': client_aktenzeichen}, CREDITOR_UPDATE_PROJECTION)
                 if not client and '/' in client_aktenzeichen:
                     normalized_az = client_aktenzeichen.replace('/', '_')
-                    client = clients_collection.find_one({'aktenzeichen': normalized_az})
+                    client = clients_collection.find_one({'aktenzeichen': normalized_az}, CREDITOR_UPDATE_PROJECTION)
 
             if not client and client_name:
                 name_to_parse = client_name.strip()
@@ -524,12 +880,11 @@ class MongoDBService:
                     first_name, last_name = (name_parts[0], name_parts[1]) if len(name_parts) == 2 else (name_to_parse, "")
 
                 if first_name and last_name:
-                    client = clients_collection.find_one({'firstName': first_name, 'lastName': last_name})
-                    if not client:
-                        client = clients_collection.find_one(
-                            {'firstName': first_name, 'lastName': last_name},
-                            collation={'locale': 'de', 'strength': 2}
-                        )
+                    client = clients_collection.find_one(
+                        {'firstName': first_name, 'lastName': last_name},
+                        CREDITOR_UPDATE_PROJECTION,
+                        collation=GERMAN_CI_COLLATION
+                    )
 
             if not client:
                 logger.warning("settlement_client_not_found",
@@ -542,12 +897,15 @@ class MongoDBService:
 
             test_mode = False
             try:
-                review_settings = self.db.review_settings.find_one({})
+                review_settings = self.db.review_settings.find_one({}, {'test_mode_enabled': 1})
                 if review_settings:
                     test_mode = review_settings.get('test_mode_enabled', False)
             except Exception:
                 pass
 
+            search_email = (creditor_email or '').lower().strip()
+            search_name = (creditor_name or '').lower().strip()
+
             for idx, cred in enumerate(creditors):
                 email_match = False
                 name_match = False
@@ -556,24 +914,10 @@ class MongoDBService:
                     pass
                 elif creditor_email and cred.get('sender_email'):
                     cred_email = cred.get('sender_email', '').lower().strip()
-                    search_email = creditor_email.lower().strip()
                     email_match = (search_email in cred_email) or (cred_email in search_email)
 
-                if creditor_name:
-                    search_name = creditor_name.lower().strip()
-                    search_words = set(w for w in search_name.split() if len(w) > 3)
-                    for name_field in ['sender_name', 'glaeubiger_name', 'glaeubigervertreter_name', 'actual_creditor']:
-                        if name_match:
-                            break
-                        field_value = cred.get(name_field)
-                        if not field_value:
-                            continue
-                        cred_name_val = field_value.lower().strip()
-                        cred_words = set(w for w in cred_name_val.split() if len(w) > 3)
-                        if cred_words and search_words and (cred_words & search_words):
-                            name_match = True
-                        if not name_match and ((search_name in cred_name_val) or (cred_name_val in search_name)):
-                            name_match = True
+                if creditor_name and not email_match:
+                    name_match = match_creditor_name(search_name, cred) is not None
 
                 if email_match or name_match:
                     matched_creditor_index = idx
@@ -588,9 +932,7 @@ class MongoDBService:
             idx = matched_creditor_index
             update_data = {
                 f'final_creditor_list.{idx}.settlement_response_status': settlement_decision,
-                f'final_creditor_list.{idx}.settlement_response_date': datetime.utcnow(),
                 f'final_creditor_list.{idx}.contact_status': 'responded',
-                f'final_creditor_list.{idx}.last_contacted_at': datetime.utcnow(),
             }
             if response_summary:
                 update_data[f'final_creditor_list.{idx}.settlement_response_text'] = response_summary
@@ -601,18 +943,30 @@ class MongoDBService:
             if extraction_confidence is not None:
                 update_data[f'final_creditor_list.{idx}.extraction_confidence'] = extraction_confidence
 
-            breaker = get_mongodb_breaker()
+            breaker = self._breaker
             try:
                 result = breaker.call(
                     clients_collection.update_one,
-                    {'_id': client['_id']},
-                    {'$set': update_data}
+                    creditor_update_filter(client, idx),
+                    {
+                        '$set': update_data,
+                        '$currentDate': {
+                            f'final_creditor_list.{idx}.settlement_response_date': True,
+                            f'final_creditor_list.{idx}.last_contacted_at': True,
+                        },
+                    }
                 )
             except CircuitBreakerError:
                 logger.error("mongodb_circuit_open_settlement", client_name=client_name)
                 raise
 
+            if result.matched_count == 0:
+                logger.warning("mongodb_creditor_list_changed",
+                              aktenzeichen=client.get('aktenzeichen'),
+                              creditor_name=creditor_name)
+                return False
             if result.modified_count > 0:
+                self._evict_cached_client(client['_id'])
                 logger.info("mongodb_settlement_updated",
                            aktenzeichen=client.get('aktenzeichen'),
                            creditor_name=creditor_name,
@@ -623,7 +977,8 @@ class MongoDBService:
                 return False
 
         except Exception as e:
-            logger.error("mongodb_settlement_update_error", error=str(e), exc_info=True)
+            logger.error("mongodb_settlement_update_error", error=str(e))
+            logger.debug("mongodb_settlement_update_error_trace", exc_info=True)
             return False
 
     def close(self):
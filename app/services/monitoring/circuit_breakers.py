@@ -10,12 +10,15 @@ Services protected:
 - Google Cloud Storage (attachment storage)
 """
 
+import atexit
 import functools
 import logging
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from typing import Dict, Optional
 
 import pybreaker
 
@@ -23,6 +26,80 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Alert email body; filled with str.format per alert
+_ALERT_BODY = """\
+CIRCUIT BREAKER ALERT
+
+Service: {name}
+Status: OPEN (service is now isolated)
+Failure Count: {fail_count}
+Reset Timeout: {reset_timeout} seconds
+
+The circuit breaker has opened after {fail_count} consecutive failures.
+Requests to this service will be blocked until the circuit automatically
+attempts recovery after {reset_timeout} seconds.
+
+ACTION REQUIRED:
+1. Investigate the root cause of failures for {name}
+2. Check service health and availability
+3. Review application logs for error details
+4. Monitor for automatic recovery or take manual action
+
+The circuit breaker will automatically attempt to close after the timeout period.
+If failures continue, the circuit will open again.
+
+Environment: {environment}"""
+
+# Alert emails are sent off the breaker's state-change path: pybreaker calls
+# listeners while holding the breaker lock, so inline SMTP would stall every
+# protected call for the length of a TLS handshake + login.
+_alert_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cb-alert")
+atexit.register(_alert_executor.shutdown, wait=False)
+
+# SMTP session reused across alerts (several breakers tend to open together).
+# Only the single cb-alert worker touches it, so it needs no lock.
+_smtp: Optional[smtplib.SMTP] = None
+
+
+def _get_smtp() -> smtplib.SMTP:
+    """Return the open SMTP session, reconnecting if the server dropped it."""
+    global _smtp
+
+    if _smtp is not None:
+        try:
+            _smtp.noop()
+            return _smtp
+        except (smtplib.SMTPException, OSError):
+            _close_smtp()
+
+    username, password = settings.smtp_username, settings.smtp_password
+    server = smtplib.SMTP(settings.smtp_host, settings.smtp_port)
+    try:
+        if username and password:
+            server.starttls()
+            server.login(username, password)
+    except Exception:
+        server.close()
+        raise
+    _smtp = server
+    return server
+
+
+def _close_smtp() -> None:
+    """Close the cached SMTP session, ignoring errors from a dead connection."""
+    global _smtp
+
+    if _smtp is None:
+        return
+    try:
+        _smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        _smtp.close()
+    _smtp = None
+
+
+atexit.register(_close_smtp)
+
 
 class CircuitBreakerEmailListener(pybreaker.CircuitBreakerListener):
     """
@@ -30,8 +107,13 @@ class CircuitBreakerEmailListener(pybreaker.CircuitBreakerListener):
 
     Sends alert emails when a circuit breaker opens, indicating that
     an external service is experiencing failures and has been isolated.
+    A breaker that keeps re-opening alerts at most once per ALERT_COOLDOWN_SECONDS.
     """
 
+    # A flapping service re-opens every reset_timeout (60s default); one mail
+    # per breaker per 5 minutes is enough to get someone looking
+    ALERT_COOLDOWN_SECONDS = 300.0
+
     def __init__(self, admin_email: str):
         """
         Initialize the email listener.
@@ -40,6 +122,9 @@ class CircuitBreakerEmailListener(pybreaker.CircuitBreakerListener):
             admin_email: Email address to receive circuit breaker alerts
         """
         self.admin_email = admin_email
+        # Breaker name -> monotonic time of the last alert
+        self._last_alert: Dict[str, float] = {}
+        self._alert_lock = threading.Lock()
 
     def state_change(self, cb: pybreaker.CircuitBreaker, old_state: pybreaker.CircuitBreakerState, new_state: pybreaker.CircuitBreakerState):
         """
@@ -60,9 +145,24 @@ class CircuitBreakerEmailListener(pybreaker.CircuitBreakerListener):
             }
         )
 
-        # Send email alert when circuit opens
-        if new_state == pybreaker.STATE_OPEN:
-            self._send_alert_email(cb)
+        # Send email alert when circuit opens (in the background). Listeners
+        # receive state objects, so compare by name
+        if new_state.name == pybreaker.STATE_OPEN and self._claim_alert(cb.name):
+            _alert_executor.submit(self._send_alert_email, cb)
+
+    def _claim_alert(self, breaker_name: str) -> bool:
+        """Return True if an alert for this breaker is due (outside the cooldown)."""
+        now = time.monotonic()
+        with self._alert_lock:
+            last = self._last_alert.get(breaker_name)
+            if last is not None and now - last < self.ALERT_COOLDOWN_SECONDS:
+                logger.info(
+                    f"Circuit breaker alert suppressed (cooldown): {breaker_name}",
+                    extra={"circuit_breaker": breaker_name}
+                )
+                return False
+            self._last_alert[breaker_name] = now
+            return True
 
     def _send_alert_email(self, cb: pybreaker.CircuitBreaker):
         """
@@ -81,42 +181,25 @@ class CircuitBreakerEmailListener(pybreaker.CircuitBreakerListener):
 
             # Compose email
             subject = f"ALERT: Circuit Breaker Opened - {cb.name}"
-            body = f"""
-CIRCUIT BREAKER ALERT
-
-Service: {cb.name}
-Status: OPEN (service is now isolated)
-Failure Count: {cb.fail_counter}
-Reset Timeout: {cb.reset_timeout} seconds
-
-The circuit breaker has opened after {cb.fail_counter} consecutive failures.
-Requests to this service will be blocked until the circuit automatically
-attempts recovery after {cb.reset_timeout} seconds.
-
-ACTION REQUIRED:
-1. Investigate the root cause of failures for {cb.name}
-2. Check service health and availability
-3. Review application logs for error details
-4. Monitor for automatic recovery or take manual action
-
-The circuit breaker will automatically attempt to close after the timeout period.
-If failures continue, the circuit will open again.
-
-Environment: {settings.environment}
-            """.strip()
+            body = _ALERT_BODY.format(
+                name=cb.name,
+                fail_count=cb.fail_counter,
+                reset_timeout=cb.reset_timeout,
+                environment=settings.environment,
+            )
 
-            msg = MIMEMultipart()
+            msg = EmailMessage()
             msg["From"] = settings.smtp_username or settings.admin_email
             msg["To"] = self.admin_email
             msg["Subject"] = subject
-            msg.attach(MIMEText(body, "plain"))
+            msg.set_content(body)
 
-            # Send via SMTP
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                if settings.smtp_username and settings.smtp_password:
-                    server.starttls()
-                    server.login(settings.smtp_username, settings.smtp_password)
-                server.send_message(msg)
+            # Send via SMTP; drop the session on failure so the next alert reconnects
+            try:
+                _get_smtp().send_message(msg)
+            except Exception:
+                _close_smtp()
+                raise
 
             logger.info(
                 f"Circuit breaker alert email sent to {self.admin_email}",
@@ -151,11 +234,31 @@ def _create_breaker(name: str, listener: CircuitBreakerEmailListener) -> pybreak
     )
 
 
+# Service name -> (pybreaker name, label for the init log)
+_BREAKER_CONFIG = {
+    "claude": ("claude_api", "Claude API"),
+    "mongodb": ("mongodb", "MongoDB"),
+    "gcs": ("google_cloud_storage", "GCS"),
+}
+
 # Module-level instances (lazy initialization)
 _email_listener: Optional[CircuitBreakerEmailListener] = None
-_claude_breaker: Optional[pybreaker.CircuitBreaker] = None
-_mongodb_breaker: Optional[pybreaker.CircuitBreaker] = None
-_gcs_breaker: Optional[pybreaker.CircuitBreaker] = None
+_breakers: Dict[str, pybreaker.CircuitBreaker] = {}
+
+
+def _get_email_listener() -> CircuitBreakerEmailListener:
+    """Lazy initialize the shared email listener."""
+    global _email_listener
+
+    if _email_listener is None:
+        admin_email = settings.circuit_breaker_alert_email or settings.admin_email
+        if admin_email:
+            _email_listener = CircuitBreakerEmailListener(admin_email)
+        else:
+            # Create dummy listener if no email configured
+            _email_listener = CircuitBreakerEmailListener("noreply@example.com")
+            logger.warning("Circuit breaker email alerts disabled: no admin email configured")
+    return _email_listener
 
 
 def get_breaker(service_name: str) -> pybreaker.CircuitBreaker:
@@ -173,39 +276,18 @@ def get_breaker(service_name: str) -> pybreaker.CircuitBreaker:
     Raises:
         ValueError: If service_name is not recognized
     """
-    global _email_listener, _claude_breaker, _mongodb_breaker, _gcs_breaker
+    breaker = _breakers.get(service_name)
+    if breaker is not None:
+        return breaker
 
-    # Lazy initialize email listener
-    if _email_listener is None:
-        admin_email = settings.circuit_breaker_alert_email or settings.admin_email
-        if admin_email:
-            _email_listener = CircuitBreakerEmailListener(admin_email)
-        else:
-            # Create dummy listener if no email configured
-            _email_listener = CircuitBreakerEmailListener("noreply@example.com")
-            logger.warning("Circuit breaker email alerts disabled: no admin email configured")
+    try:
+        breaker_name, label = _BREAKER_CONFIG[service_name]
+    except KeyError:
+        raise ValueError(f"Unknown service name: {service_name}. Must be 'claude', 'mongodb', or 'gcs'") from None
 
-    # Lazy initialize breakers
-    if service_name == "claude":
-        if _claude_breaker is None:
-            _claude_breaker = _create_breaker("claude_api", _email_listener)
-            logger.info("Initialized Claude API circuit breaker")
-        return _claude_breaker
-
-    elif service_name == "mongodb":
-        if _mongodb_breaker is None:
-            _mongodb_breaker = _create_breaker("mongodb", _email_listener)
-            logger.info("Initialized MongoDB circuit breaker")
-        return _mongodb_breaker
-
-    elif service_name == "gcs":
-        if _gcs_breaker is None:
-            _gcs_breaker = _create_breaker("google_cloud_storage", _email_listener)
-            logger.info("Initialized GCS circuit breaker")
-        return _gcs_breaker
-
-    else:
-        raise ValueError(f"Unknown service name: {service_name}. Must be 'claude', 'mongodb', or 'gcs'")
+    breaker = _breakers[service_name] = _create_breaker(breaker_name, _get_email_listener())
+    logger.info(f"Initialized {label} circuit breaker")
+    return breaker
 
 
 def get_claude_breaker() -> pybreaker.CircuitBreaker:
@@ -258,9 +340,13 @@ def with_circuit_breaker(service_name: str):
         CircuitBreakerError: If circuit is open (service unavailable)
     """
     def decorator(func):
+        breaker = None  # resolved on first call, not at import time
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            breaker = get_breaker(service_name)
+            nonlocal breaker
+            if breaker is None:
+                breaker = get_breaker(service_name)
             return breaker.call(func, *args, **kwargs)
         return wrapper
     return decorator
@@ -8,6 +8,12 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Resolved once: the helpers below run on every processing step
+try:
+    import sentry_sdk as _sentry
+except ImportError:
+    _sentry = None
+
 
 def init_sentry() -> None:
     """
@@ -22,11 +28,14 @@ def init_sentry() -> None:
         logger.warning("Sentry DSN not configured - error tracking disabled")
         return
 
+    if _sentry is None:
+        logger.warning("sentry_sdk not installed - error tracking disabled")
+        return
+
     try:
-        import sentry_sdk
         from sentry_sdk.integrations.fastapi import FastApiIntegration
 
-        sentry_sdk.init(
+        _sentry.init(
             dsn=settings.sentry_dsn,
             environment=settings.sentry_environment or settings.environment,
             traces_sample_rate=0.1,  # 10% of requests traced
@@ -65,22 +74,23 @@ def set_processing_context(
         actor: Name of the actor/stage (e.g., "email_processor", "content_extractor")
         correlation_id: Optional correlation ID for request tracking
     """
-    try:
-        import sentry_sdk
+    if _sentry is None:
+        # Sentry not installed
+        return
 
-        sentry_sdk.set_context("processing", {
-            "email_id": email_id,
-            "actor": actor,
-            "correlation_id": correlation_id or "none"
-        })
-        sentry_sdk.set_tag("email_id", str(email_id))
-        sentry_sdk.set_tag("actor", actor)
+    # Resolve the scope once (the top-level set_* helpers each look it up);
+    # the isolation scope is where sentry_sdk.set_tag/set_context write in 2.x
+    scope = _sentry.get_isolation_scope()
+    scope.set_context("processing", {
+        "email_id": email_id,
+        "actor": actor,
+        "correlation_id": correlation_id or "none"
+    })
+    scope.set_tag("email_id", str(email_id))
+    scope.set_tag("actor", actor)
 
-        if correlation_id:
-            sentry_sdk.set_tag("correlation_id", correlation_id)
-    except ImportError:
-        # Sentry not installed or disabled
-        pass
+    if correlation_id:
+        scope.set_tag("correlation_id", correlation_id)
 
 
 def add_breadcrumb(
@@ -100,18 +110,16 @@ def add_breadcrumb(
         level: Severity level ("debug", "info", "warning", "error")
         data: Additional structured data
     """
-    try:
-        import sentry_sdk
+    if _sentry is None:
+        # Sentry not installed
+        return
 
-        sentry_sdk.add_breadcrumb(
-            category=category,
-            message=message,
-            level=level,
-            data=data or {}
-        )
-    except ImportError:
-        # Sentry not installed or disabled
-        pass
+    _sentry.add_breadcrumb(
+        category=category,
+        message=message,
+        level=level,
+        data=data or {}
+    )
 
 
 def capture_message(message: str, level: str = "info") -> None:
@@ -124,10 +132,8 @@ def capture_message(message: str, level: str = "info") -> None:
         message: Message to capture
         level: Severity level ("debug", "info", "warning", "error", "fatal")
     """
-    try:
-        import sentry_sdk
+    if _sentry is None:
+        # Sentry not installed
+        return
 
-        sentry_sdk.capture_message(message, level=level)
-    except ImportError:
-        # Sentry not installed or disabled
-        pass
+    _sentry.capture_message(message, level=level)
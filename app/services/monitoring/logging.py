@@ -3,12 +3,23 @@ Structured JSON Logging with Correlation ID
 Provides JSON formatter that automatically injects correlation IDs into all log entries
 """
 
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
 import os
 from pythonjsonlogger import jsonlogger
 from asgi_correlation_id.context import correlation_id
 
+# orjson serializes log records several times faster than stdlib json;
+# fall back to python-json-logger's default serializer without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class CorrelationJsonFormatter(jsonlogger.JsonFormatter):
     """
@@ -18,6 +29,15 @@ class CorrelationJsonFormatter(jsonlogger.JsonFormatter):
     The correlation ID is retrieved from async context (set by CorrelationIdMiddleware).
     """
 
+    SERVICE_NAME = 'creditor-answer-analysis'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Fixed for the process lifetime: read once, not per log record
+        self._environment = os.getenv('ENVIRONMENT', 'development')
+        # Same fallback for non-JSON types (datetimes, exceptions, str()) as the stdlib path
+        self._orjson_default = self.json_default or jsonlogger.JsonEncoder().default
+
     def add_fields(self, log_record, record, message_dict):
         """
         Add custom fields to log record.
@@ -34,14 +54,56 @@ class CorrelationJsonFormatter(jsonlogger.JsonFormatter):
         """
         super().add_fields(log_record, record, message_dict)
 
-        # Add correlation ID from async context
-        log_record['correlation_id'] = correlation_id.get() or 'none'
+        # Add correlation ID: snapshotted at emit time when the record went
+        # through CorrelationQueueHandler, else read from the async context
+        if hasattr(record, 'correlation_id'):
+            cid = record.correlation_id
+        else:
+            cid = correlation_id.get()
+        log_record['correlation_id'] = cid or 'none'
 
         # Add service identifier
-        log_record['service'] = 'creditor-answer-analysis'
+        log_record['service'] = self.SERVICE_NAME
 
         # Add environment
-        log_record['environment'] = os.getenv('ENVIRONMENT', 'development')
+        log_record['environment'] = self._environment
+
+    def jsonify_log_record(self, log_record):
+        """Serialize the log record with orjson when available."""
+        if orjson is None:
+            return super().jsonify_log_record(log_record)
+        return orjson.dumps(
+            log_record,
+            default=self._orjson_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        ).decode()
+
+
+# Renders tracebacks on the emitting thread (see CorrelationQueueHandler)
+_EXC_FORMATTER = logging.Formatter()
+
+
+class CorrelationQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps records intact for the JSON formatter.
+
+    The stdlib prepare() pre-formats the record with a plain Formatter,
+    folding the traceback into the message. This version only resolves the
+    message arguments, renders the traceback into exc_text (which the JSON
+    formatter emits as exc_info) and snapshots the correlation ID, which
+    lives in a contextvar the listener thread cannot see.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.correlation_id = correlation_id.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 def setup_logging():
@@ -50,8 +112,10 @@ def setup_logging():
 
     Sets up root logger with:
     - CorrelationJsonFormatter for machine-parseable JSON output
-    - INFO level logging (production default)
-    - StreamHandler outputting to stdout
+    - INFO level logging (production default, LOG_LEVEL overrides)
+    - StreamHandler outputting to stdout, fed through a queue: the logging
+      thread only enqueues; JSON formatting and the stdout write happen on
+      a QueueListener thread
 
     All subsequent logging calls (logging.info, logger.info, etc.) will
     automatically output JSON with correlation_id, timestamp, level, etc.
@@ -70,8 +134,15 @@ def setup_logging():
     )
     handler.setFormatter(formatter)
 
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    # Drain queued records before the interpreter exits
+    atexit.register(listener.stop)
+
     root_logger = logging.getLogger()
-    root_logger.addHandler(handler)
-    root_logger.setLevel(logging.INFO)  # INFO level for production
+    root_logger.addHandler(CorrelationQueueHandler(log_queue))
+    level = logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    root_logger.setLevel(level if isinstance(level, int) else logging.INFO)  # INFO unless LOG_LEVEL says otherwise
 
     return handler
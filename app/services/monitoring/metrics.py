@@ -9,9 +9,11 @@ Provides methods for recording pipeline health metrics:
 - Confidence distribution
 
 Follows DualDatabaseWriter pattern: does NOT commit, caller controls transaction.
+Metrics are buffered and written by flush() as one multi-row INSERT.
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.operational_metrics import OperationalMetrics
 
@@ -21,6 +23,7 @@ class MetricsCollector:
     Service for recording operational metrics.
 
     Does NOT commit - caller controls transaction (same pattern as DualDatabaseWriter).
+    record_* calls only buffer rows; call flush() before the caller's commit.
     """
 
     def __init__(self, db: Session):
@@ -31,6 +34,32 @@ class MetricsCollector:
             db: Database session (caller-managed)
         """
         self.db = db
+        self._pending: List[Dict[str, Any]] = []
+
+    def _record(
+        self,
+        metric_type: str,
+        metric_value: float,
+        labels: Dict[str, str],
+        email_id: Optional[int] = None
+    ) -> None:
+        self._pending.append({
+            "metric_type": metric_type,
+            "metric_value": metric_value,
+            "labels": labels,
+            "email_id": email_id,
+        })
+
+    def flush(self) -> None:
+        """
+        Write all buffered metrics in one INSERT (no unit-of-work bookkeeping).
+
+        Does NOT commit - the rows join the caller's transaction.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self.db.execute(insert(OperationalMetrics), pending)
 
     def record_queue_depth(self, queue_name: str, depth: int) -> None:
         """
@@ -40,12 +69,7 @@ class MetricsCollector:
             queue_name: Name of the queue (e.g., "email_processing")
             depth: Number of items in queue
         """
-        metric = OperationalMetrics(
-            metric_type="queue_depth",
-            metric_value=float(depth),
-            labels={"queue": queue_name}
-        )
-        self.db.add(metric)
+        self._record("queue_depth", float(depth), {"queue": queue_name})
 
     def record_processing_time(
         self,
@@ -63,13 +87,12 @@ class MetricsCollector:
             duration_ms: Duration in milliseconds
             email_id: Optional link to specific email
         """
-        metric = OperationalMetrics(
-            metric_type="processing_time_ms",
-            metric_value=float(duration_ms),
-            labels={"actor": actor_name, "stage": stage},
+        self._record(
+            "processing_time_ms",
+            float(duration_ms),
+            {"actor": actor_name, "stage": stage},
             email_id=email_id
         )
-        self.db.add(metric)
 
     def record_error(
         self,
@@ -85,13 +108,12 @@ class MetricsCollector:
             error_type: Type of error (e.g., "TimeoutError", "ValidationError")
             email_id: Optional link to specific email
         """
-        metric = OperationalMetrics(
-            metric_type="error_count",
-            metric_value=1.0,  # Count as 1 error
-            labels={"actor": actor_name, "error_type": error_type},
+        self._record(
+            "error_count",
+            1.0,  # Count as 1 error
+            {"actor": actor_name, "error_type": error_type},
             email_id=email_id
         )
-        self.db.add(metric)
 
     def record_token_usage(
         self,
@@ -109,13 +131,12 @@ class MetricsCollector:
             tokens: Total tokens used (input + output)
             email_id: Optional link to specific email
         """
-        metric = OperationalMetrics(
-            metric_type="token_usage",
-            metric_value=float(tokens),
-            labels={"model": model, "operation": operation},
+        self._record(
+            "token_usage",
+            float(tokens),
+            {"model": model, "operation": operation},
             email_id=email_id
         )
-        self.db.add(metric)
 
     def record_confidence(
         self,
@@ -134,13 +155,7 @@ class MetricsCollector:
         if bucket not in ("high", "medium", "low"):
             raise ValueError(f"Invalid confidence bucket: {bucket}")
 
-        metric = OperationalMetrics(
-            metric_type="confidence_score",
-            metric_value=score,
-            labels={"bucket": bucket},
-            email_id=email_id
-        )
-        self.db.add(metric)
+        self._record("confidence_score", score, {"bucket": bucket}, email_id=email_id)
 
 
 def get_metrics_collector(db: Session) -> MetricsCollector:
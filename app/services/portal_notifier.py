@@ -19,10 +19,23 @@ import hashlib
 import json
 import time
 import logging
+from functools import lru_cache
 from typing import Optional, List, Any, Dict
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    # Datetimes/dataclasses go through default=str as with json.dumps, so
+    # the payload format stays the same; only serialization gets faster
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+except ImportError:
+    orjson = None
+
 # Lazy-initialized HTTP client
 _http_client = None
 
@@ -31,12 +44,36 @@ def _get_client():
     """Lazy-init httpx client to avoid import-time side effects."""
     global _http_client
     if _http_client is None:
+        import atexit
         import httpx
-        _http_client = httpx.Client(timeout=10.0)
+        # One pooled client per process: worker threads share keep-alive
+        # connections to the portal instead of paying TCP+TLS per webhook.
+        # Connect fails fast so an unreachable portal doesn't hold an actor.
+        _http_client = httpx.Client(
+            timeout=httpx.Timeout(10.0, connect=2.0),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+        atexit.register(_http_client.close)
     return _http_client
 
 
-def _build_headers(body: str, *, settings) -> Dict[str, str]:
+def _dumps_payload(payload: Dict[str, Any]) -> bytes:
+    """Serialize a webhook payload to the exact bytes that are signed and sent."""
+    if orjson is not None:
+        return orjson.dumps(payload, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(payload, default=str).encode()
+
+
+@lru_cache(maxsize=4)
+def _hmac_template(secret: str) -> "hmac.HMAC":
+    """
+    Keyed HMAC-SHA256 with nothing fed yet; callers .copy() it per request
+    so the key padding is derived once per secret instead of per webhook.
+    """
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
+def _build_headers(body: bytes, *, settings) -> Dict[str, str]:
     """
     Construct the request headers, including HMAC signatures.
 
@@ -54,15 +91,17 @@ def _build_headers(body: str, *, settings) -> Dict[str, str]:
 
     legacy_secret = getattr(settings, "portal_webhook_secret", None)
     if legacy_secret:
-        sig = hmac.new(legacy_secret.encode(), body.encode(), hashlib.sha256).hexdigest()
-        headers["X-Webhook-Signature"] = sig
+        mac = _hmac_template(legacy_secret).copy()
+        mac.update(body)
+        headers["X-Webhook-Signature"] = mac.hexdigest()
 
     matcher_secret = getattr(settings, "matcher_portal_hmac_secret", None)
     if matcher_secret:
         timestamp_ms = str(int(time.time() * 1000))
-        signed = (timestamp_ms + body).encode()
-        sig = hmac.new(matcher_secret.encode(), signed, hashlib.sha256).hexdigest()
-        headers["X-Matcher-Signature"] = sig
+        mac = _hmac_template(matcher_secret).copy()
+        mac.update(timestamp_ms.encode())
+        mac.update(body)
+        headers["X-Matcher-Signature"] = mac.hexdigest()
         headers["X-Matcher-Timestamp"] = timestamp_ms
 
     return headers
@@ -219,7 +258,8 @@ def notify_creditor_response(
         "raw_eml_gcs_path": raw_eml_gcs_path,
     }
 
-    body = json.dumps(payload, default=str)
+    # Encoded once: the same bytes are signed and sent
+    body = _dumps_payload(payload)
     headers_out = _build_headers(body, settings=settings)
 
     try:
@@ -325,7 +365,8 @@ def notify_settlement_response(
         "raw_eml_gcs_path": raw_eml_gcs_path,
     }
 
-    body = json.dumps(payload, default=str)
+    # Encoded once: the same bytes are signed and sent
+    body = _dumps_payload(payload)
     headers_out = _build_headers(body, settings=settings)
 
     try:
@@ -384,7 +425,8 @@ def notify_portal_bounce(
         "kanzlei_id": kanzlei_id,
         "event_id": event_id or f"matcher-bounce:{resend_email_id}",
     }
-    body = json.dumps(payload, default=str)
+    # Encoded once: the same bytes are signed and sent
+    body = _dumps_payload(payload)
     headers_out = _build_headers(body, settings=settings)
 
     try:
@@ -3,10 +3,12 @@ Processing Report Service
 Generates and queries per-email processing reports for operational visibility
 """
 
-from datetime import date
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.models.processing_report import ProcessingReport
 
@@ -42,8 +44,26 @@ def create_processing_report(
         processing_time_ms: Optional processing time in milliseconds
 
     Returns:
-        ProcessingReport instance (flushed but not committed)
+        ProcessingReport instance (written but not committed)
     """
+    # Per-field confidence (Agent 3) and the source are looked up once, not per field
+    confidence_scores = {}
+    if agent_checkpoints:
+        agent_3 = agent_checkpoints.get("agent_3_consolidation", {})
+        if isinstance(agent_3, dict):
+            confidence_scores = agent_3.get("confidence_scores", {})
+            if not isinstance(confidence_scores, dict):
+                confidence_scores = {}
+
+    source = "unknown"
+    extraction_metadata = extracted_data.get("extraction_metadata", {})
+    if isinstance(extraction_metadata, dict):
+        source = (
+            extraction_metadata.get("primary_source")
+            or extraction_metadata.get("extraction_method")
+            or "unknown"
+        )
+
     # Build extracted_fields with per-field confidence
     extracted_fields = {}
     key_fields = ["client_name", "creditor_name", "debt_amount", "reference_numbers"]
@@ -51,15 +71,9 @@ def create_processing_report(
     for field in key_fields:
         value = extracted_data.get(field)
         if value and value != "" and value != []:
-            # Get confidence from agent checkpoints or default
-            field_confidence = _get_field_confidence(field, agent_checkpoints)
-
-            # Get source from extraction metadata
-            source = _get_field_source(field, extracted_data)
-
             extracted_fields[field] = {
                 "value": value,
-                "confidence": field_confidence,
+                "confidence": confidence_scores.get(field, 0.5),
                 "source": source
             }
 
@@ -88,43 +102,30 @@ def create_processing_report(
                 sources_processed = extraction_meta.get("sources_processed", 1)
                 total_tokens_used = extraction_meta.get("total_tokens_used", 0)
 
-    # Check if report already exists (upsert pattern)
-    existing = db.query(ProcessingReport).filter(
-        ProcessingReport.email_id == email_id
-    ).first()
-
-    if existing:
-        # Update existing report
-        existing.extracted_fields = extracted_fields
-        existing.missing_fields = missing_fields if missing_fields else None
-        existing.overall_confidence = overall_confidence
-        existing.confidence_route = confidence_route
-        existing.needs_review = needs_review
-        existing.review_reason = review_reason
-        existing.intent = intent
-        existing.sources_processed = sources_processed
-        existing.total_tokens_used = total_tokens_used
-        existing.processing_time_ms = processing_time_ms
-        db.flush()
-        return existing
-    else:
-        # Create new report
-        report = ProcessingReport(
-            email_id=email_id,
-            extracted_fields=extracted_fields,
-            missing_fields=missing_fields if missing_fields else None,
-            overall_confidence=overall_confidence,
-            confidence_route=confidence_route,
-            needs_review=needs_review,
-            review_reason=review_reason,
-            intent=intent,
-            sources_processed=sources_processed,
-            total_tokens_used=total_tokens_used,
-            processing_time_ms=processing_time_ms
-        )
-        db.add(report)
-        db.flush()
-        return report
+    row = {
+        "email_id": email_id,
+        "extracted_fields": extracted_fields,
+        "missing_fields": missing_fields if missing_fields else None,
+        "overall_confidence": overall_confidence,
+        "confidence_route": confidence_route,
+        "needs_review": needs_review,
+        "review_reason": review_reason,
+        "intent": intent,
+        "sources_processed": sources_processed,
+        "total_tokens_used": total_tokens_used,
+        "processing_time_ms": processing_time_ms,
+    }
+
+    # Upsert in one statement on uq_processing_report_email (SQLite in dev/tests)
+    insert = sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
+    stmt = insert(ProcessingReport).values(**row)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["email_id"],
+        set_={k: stmt.excluded[k] for k in row if k != "email_id"},
+    ).returning(ProcessingReport)
+
+    # populate_existing refreshes a report already loaded in this session
+    return db.scalars(stmt, execution_options={"populate_existing": True}).one()
 
 
 def get_processing_report(db: Session, email_id: int) -> Optional[ProcessingReport]:
@@ -167,67 +168,71 @@ def get_reports_by_date_range(
     ).order_by(ProcessingReport.created_at.desc()).all()
 
 
-def get_reports_needing_review(db: Session, limit: int = 100) -> List[ProcessingReport]:
-    """
-    Get reports that need manual review.
-
-    Args:
-        db: Database session
-        limit: Maximum number of reports to return
-
-    Returns:
-        List of ProcessingReports needing review, ordered by created_at desc
+def get_reports_by_date_range_page(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    cursor: Optional[Tuple[datetime, int]] = None,
+    limit: int = 100
+) -> Tuple[List[ProcessingReport], Optional[Tuple[datetime, int]]]:
     """
-    return db.query(ProcessingReport).filter(
-        ProcessingReport.needs_review == True
-    ).order_by(ProcessingReport.created_at.desc()).limit(limit).all()
+    Get one page of processing reports by created date range (keyset pagination).
 
-
-def _get_field_confidence(field: str, agent_checkpoints: dict) -> float:
-    """
-    Extract per-field confidence from agent checkpoints.
+    Unlike get_reports_by_date_range this never materializes the whole window:
+    each page is an index range scan on idx_processing_report_created that
+    stops after limit rows. The cursor is (created_at, id) so reports sharing
+    a timestamp are neither skipped nor repeated.
 
     Args:
-        field: Field name
-        agent_checkpoints: Multi-agent pipeline checkpoints
+        db: Database session
+        start_date: Start date (inclusive)
+        end_date: End date (exclusive, as in get_reports_by_date_range)
+        cursor: next_cursor from the previous page, or None for the first page
+        limit: Maximum number of reports per page
 
     Returns:
-        Confidence score or 0.5 default
+        Tuple of (reports ordered by created_at desc, next_cursor or None
+        when this was the last page)
+
+    Example:
+        cursor = None
+        while True:
+            reports, cursor = get_reports_by_date_range_page(db, start, end, cursor)
+            ...
+            if cursor is None:
+                break
     """
-    if not agent_checkpoints:
-        return 0.5
+    query = db.query(ProcessingReport).filter(
+        and_(
+            ProcessingReport.created_at >= start_date,
+            ProcessingReport.created_at < end_date
+        )
+    )
+    if cursor is not None:
+        query = query.filter(
+            tuple_(ProcessingReport.created_at, ProcessingReport.id) < tuple_(*cursor)
+        )
 
-    # Check Agent 3 consolidation for per-field confidence
-    agent_3 = agent_checkpoints.get("agent_3_consolidation", {})
-    if isinstance(agent_3, dict):
-        confidence_scores = agent_3.get("confidence_scores", {})
-        if isinstance(confidence_scores, dict) and field in confidence_scores:
-            return confidence_scores[field]
+    reports = query.order_by(
+        ProcessingReport.created_at.desc(), ProcessingReport.id.desc()
+    ).limit(limit).all()
 
-    # Default to 0.5 if not found
-    return 0.5
+    next_cursor = (reports[-1].created_at, reports[-1].id) if len(reports) == limit else None
+    return reports, next_cursor
 
 
-def _get_field_source(field: str, extracted_data: dict) -> str:
+def get_reports_needing_review(db: Session, limit: int = 100) -> List[ProcessingReport]:
     """
-    Extract source information for a field.
+    Get reports that need manual review.
 
     Args:
-        field: Field name
-        extracted_data: Extraction results
+        db: Database session
+        limit: Maximum number of reports to return
 
     Returns:
-        Source string (e.g., "email_body", "pdf", "scanned_pdf")
+        List of ProcessingReports needing review, ordered by created_at desc
     """
-    extraction_metadata = extracted_data.get("extraction_metadata", {})
-    if isinstance(extraction_metadata, dict):
-        # Look for primary_source or extraction_method
-        primary_source = extraction_metadata.get("primary_source")
-        if primary_source:
-            return primary_source
-
-        extraction_method = extraction_metadata.get("extraction_method")
-        if extraction_method:
-            return extraction_method
+    return db.query(ProcessingReport).filter(
+        ProcessingReport.needs_review == True
+    ).order_by(ProcessingReport.created_at.desc()).limit(limit).all()
 
-    return "unknown"
@@ -3,8 +3,12 @@ PromptVersionManager Service
 Manages prompt version lifecycle: create, activate, rollback
 """
 
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func, or_, select, update
 import structlog
 
 from app.models.prompt_template import PromptTemplate
@@ -12,6 +16,18 @@ from app.models.prompt_template import PromptTemplate
 logger = structlog.get_logger(__name__)
 
 
+@dataclass(frozen=True)
+class ActivePrompt:
+    """The columns of the active PromptTemplate that extraction callers use."""
+    id: int
+    version: int
+    system_prompt: Optional[str]
+    user_prompt_template: str
+    model_name: Optional[str]
+    temperature: Optional[float]
+    max_tokens: Optional[int]
+
+
 class PromptVersionManager:
     """
     Manages prompt version lifecycle: create, activate, rollback.
@@ -22,8 +38,27 @@ class PromptVersionManager:
     - Free-form names
 
     Per RESEARCH.md Pattern 4: Explicit activation with historical rollback.
+
+    Active prompt lookups are cached in-process for CACHE_TTL_SECONDS. Prompt
+    versions are immutable, so only activation changes the result; it
+    invalidates this process's cache, other processes pick it up within
+    one TTL window.
     """
 
+    # Active prompts change only on explicit activation
+    CACHE_TTL_SECONDS = 60.0
+
+    # (task_type, name) -> (expires_at, active version or None)
+    _active_cache: Dict[Tuple[str, str], Tuple[float, Optional[ActivePrompt]]] = {}
+
+    @classmethod
+    def invalidate_cache(cls, task_type: Optional[str] = None, name: Optional[str] = None) -> None:
+        """Drop the cached active prompt for (task_type, name), or all of them."""
+        if task_type is None:
+            cls._active_cache.clear()
+        else:
+            cls._active_cache.pop((task_type, name), None)
+
     def __init__(self, db: Session):
         """
         Initialize manager with database session.
@@ -33,33 +68,51 @@ class PromptVersionManager:
         """
         self.db = db
 
-    def get_active_prompt(self, task_type: str, name: str) -> PromptTemplate | None:
+    def get_active_prompt(self, task_type: str, name: str) -> ActivePrompt | None:
         """
         Get currently active prompt template.
 
         Uses partial index on (task_type, name) WHERE is_active = TRUE
-        for fast lookups (per RESEARCH.md).
+        for fast lookups (per RESEARCH.md), behind the in-process cache.
+        Only the columns callers need are selected; the result is an
+        immutable ActivePrompt, shared between calls.
 
         Args:
             task_type: e.g., 'classification', 'extraction', 'validation'
             name: Human-readable prompt name
 
         Returns:
-            Active PromptTemplate or None if no active version
+            Active prompt or None if no active version
 
         Example:
             manager = PromptVersionManager(db)
             prompt = manager.get_active_prompt('classification', 'email_intent')
         """
-        prompt = self.db.query(PromptTemplate).filter(
-            and_(
-                PromptTemplate.task_type == task_type,
-                PromptTemplate.name == name,
-                PromptTemplate.is_active == True
-            )
-        ).first()
-
-        if not prompt:
+        key = (task_type, name)
+        entry = self._active_cache.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            prompt = entry[1]
+        else:
+            # activate_version keeps at most one active row per (task_type, name)
+            row = self.db.execute(
+                select(
+                    PromptTemplate.id,
+                    PromptTemplate.version,
+                    PromptTemplate.system_prompt,
+                    PromptTemplate.user_prompt_template,
+                    PromptTemplate.model_name,
+                    PromptTemplate.temperature,
+                    PromptTemplate.max_tokens
+                ).where(
+                    PromptTemplate.task_type == task_type,
+                    PromptTemplate.name == name,
+                    PromptTemplate.is_active == True
+                )
+            ).one_or_none()
+            prompt = ActivePrompt(**row._mapping) if row else None
+            self._active_cache[key] = (time.monotonic() + self.CACHE_TTL_SECONDS, prompt)
+
+        if prompt is None:
             logger.warning(
                 "no_active_prompt",
                 task_type=task_type,
@@ -89,7 +142,7 @@ class PromptVersionManager:
 
         Per USER DECISION: explicit activation required.
 
-        Atomically:
+        Atomically, in a single UPDATE:
         1. Deactivate current active version (if any)
         2. Activate target version
         3. Log activation event
@@ -112,33 +165,29 @@ class PromptVersionManager:
                 'classification', 'email_intent', 2, 'admin@example.com'
             )
         """
-        # Find target version
-        target = self.db.query(PromptTemplate).filter(
-            and_(
+        # One UPDATE swaps the flag on both rows: the target becomes active,
+        # whatever was active becomes inactive. RETURNING hands back the
+        # touched rows so no SELECT is needed to find either of them.
+        touched = self.db.scalars(
+            update(PromptTemplate)
+            .where(
                 PromptTemplate.task_type == task_type,
                 PromptTemplate.name == name,
-                PromptTemplate.version == version
+                or_(PromptTemplate.is_active == True, PromptTemplate.version == version)
             )
-        ).first()
+            .values(is_active=case((PromptTemplate.version == version, True), else_=False))
+            .returning(PromptTemplate)
+        ).all()
 
+        target = next((p for p in touched if p.version == version), None)
         if not target:
+            self.db.rollback()
             raise ValueError(
                 f"Prompt version not found: {task_type}.{name} v{version}"
             )
 
-        # Deactivate current active version (if any)
-        current_active = self.db.query(PromptTemplate).filter(
-            and_(
-                PromptTemplate.task_type == task_type,
-                PromptTemplate.name == name,
-                PromptTemplate.is_active == True
-            )
-        ).first()
-
-        previous_version = None
-        if current_active:
-            previous_version = current_active.version
-            current_active.is_active = False
+        previous_version = next((p.version for p in touched if p.version != version), None)
+        if previous_version is not None:
             logger.info(
                 "prompt_version_deactivated",
                 task_type=task_type,
@@ -146,9 +195,8 @@ class PromptVersionManager:
                 version=previous_version
             )
 
-        # Activate target version
-        target.is_active = True
         self.db.commit()
+        self.invalidate_cache(task_type, name)
 
         logger.info(
             "prompt_version_activated",
@@ -237,7 +285,7 @@ class PromptVersionManager:
             max_tokens: Max tokens parameter
 
         Returns:
-            Created PromptTemplate (inactive)
+            Created PromptTemplate (inactive, detached from the session)
 
         Example:
             manager = PromptVersionManager(db)
@@ -274,9 +322,13 @@ class PromptVersionManager:
             max_tokens=max_tokens
         )
 
+        # eager_defaults loads id/created_at from the INSERT's RETURNING; detaching
+        # before commit keeps those values instead of expiring them, so no
+        # refresh SELECT is needed
         self.db.add(new_version)
+        self.db.flush()
+        self.db.expunge(new_version)
         self.db.commit()
-        self.db.refresh(new_version)
 
         logger.info(
             "prompt_version_created",
@@ -323,7 +375,7 @@ class PromptVersionManager:
         return versions
 
 
-def get_active_prompt(db: Session, task_type: str, name: str) -> PromptTemplate | None:
+def get_active_prompt(db: Session, task_type: str, name: str) -> ActivePrompt | None:
     """
     Convenience function for loading active prompt.
 
@@ -333,7 +385,7 @@ def get_active_prompt(db: Session, task_type: str, name: str) -> PromptTemplate
         name: Human-readable prompt name
 
     Returns:
-        Active PromptTemplate or None if no active version
+        Active prompt or None if no active version
 
     Example:
         from app.services.prompt_manager import get_active_prompt
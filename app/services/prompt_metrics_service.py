@@ -1,12 +1,22 @@
 """
 PromptMetricsService
 Records extraction-level performance metrics with cost calculation
+
+Extraction metrics are buffered in-process and written in batches by
+MetricsBuffer; use the *_sync variants when the caller needs the row id.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, insert
+from sqlalchemy.engine import Engine
+from collections import deque
 from decimal import Decimal
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import atexit
+import logging
+import threading
+import time
 import structlog
 
 from app.models.prompt_metrics import PromptPerformanceMetrics
@@ -14,12 +24,12 @@ from app.models.prompt_metrics import PromptPerformanceMetrics
 logger = structlog.get_logger(__name__)
 
 # Claude API pricing (as of 2026)
-# Per 1K tokens
+# Integer micro-USD per 1M tokens ($3/MTok -> 3_000_000), so costs are exact integer math
 CLAUDE_PRICING = {
-    'claude-sonnet-4-5-20250514': {'input': 0.003, 'output': 0.015},
-    'claude-haiku-4-20250514': {'input': 0.00025, 'output': 0.00125},
+    'claude-sonnet-4-5-20250514': {'input_per_mtok_microusd': 3_000_000, 'output_per_mtok_microusd': 15_000_000},
+    'claude-haiku-4-20250514': {'input_per_mtok_microusd': 250_000, 'output_per_mtok_microusd': 1_250_000},
     # Fallback for unknown models
-    'default': {'input': 0.003, 'output': 0.015}
+    'default': {'input_per_mtok_microusd': 3_000_000, 'output_per_mtok_microusd': 15_000_000}
 }
 
 
@@ -41,26 +51,116 @@ def calculate_api_cost(
 
     Example:
         cost = calculate_api_cost('claude-sonnet-4-5-20250514', 1000, 500)
-        # Returns: Decimal('0.010500') (1000*0.003/1000 + 500*0.015/1000)
+        # Returns: Decimal('0.010500') (1000*3 + 500*15 USD per 1M tokens)
     """
     # Get pricing for model (fallback to default if not found)
     pricing = CLAUDE_PRICING.get(model_name, CLAUDE_PRICING['default'])
 
-    # Calculate cost per 1K tokens
-    input_cost = (input_tokens / 1000) * pricing['input']
-    output_cost = (output_tokens / 1000) * pricing['output']
+    # tokens * micro-USD/MTok is in millionths of a micro-USD; round half up to whole micro-USD
+    micro_usd = (
+        input_tokens * pricing['input_per_mtok_microusd']
+        + output_tokens * pricing['output_per_mtok_microusd']
+        + 500_000
+    ) // 1_000_000
 
-    total_cost = Decimal(str(input_cost + output_cost)).quantize(Decimal('0.000001'))
+    return Decimal(micro_usd).scaleb(-6)
 
-    logger.debug(
-        "api_cost_calculated",
-        model_name=model_name,
-        input_tokens=input_tokens,
-        output_tokens=output_tokens,
-        cost_usd=float(total_cost)
-    )
 
-    return total_cost
+class MetricsBuffer:
+    """
+    Batches extraction metric rows into multi-row INSERTs.
+
+    add() only appends a dict; rows are written in their own transaction once
+    batch_size rows are pending, or by a daemon thread every flush_interval
+    seconds, and at interpreter exit. The engine is taken from the first
+    session that adds a row. A batch that fails to write is re-queued once
+    and dropped (with a warning giving the row count) if it fails again.
+    """
+
+    BATCH_SIZE = 50
+    FLUSH_INTERVAL_SECONDS = 5.0
+
+    def __init__(self, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._rows: deque = deque()
+        self._requeued: List[Dict[str, Any]] = []  # rows whose first write failed
+        self._lock = threading.Lock()
+        self._bind: Optional[Engine] = None
+        self._flusher: Optional[threading.Thread] = None
+
+    def add(self, db: Session, row: Dict[str, Any]) -> None:
+        """Buffer one row; writes the batch inline when it is full."""
+        with self._lock:
+            if self._bind is None:
+                self._bind = db.get_bind()
+            self._rows.append(row)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run, name="prompt-metrics-flush", daemon=True)
+                self._flusher.start()
+            full = len(self._rows) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows in one INSERT and commit."""
+        with self._lock:
+            if not self._rows and not self._requeued:
+                return
+            retried, self._requeued = self._requeued, []
+            rows: List[Dict[str, Any]] = list(self._rows)
+            self._rows.clear()
+            bind = self._bind
+
+        try:
+            with Session(bind=bind) as session:
+                session.execute(insert(PromptPerformanceMetrics), retried + rows)
+                session.commit()
+        except Exception as e:
+            # Metrics must never fail extraction: new rows get one more try
+            # with the next flush, rows that already had theirs are dropped
+            with self._lock:
+                self._requeued.extend(rows)
+            logger.warning("extraction_metrics_flush_failed",
+                           requeued=len(rows),
+                           dropped=len(retried),
+                           error=str(e))
+            return
+
+        logger.info("extraction_metrics_flushed", rows=len(retried) + len(rows))
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+
+_metrics_buffer = MetricsBuffer()
+atexit.register(_metrics_buffer.flush)
+
+
+def _metrics_row(
+    prompt_template_id: int,
+    email_id: int,
+    input_tokens: int,
+    output_tokens: int,
+    model_name: str,
+    extraction_success: bool,
+    confidence_score: float | None,
+    manual_review_required: bool | None,
+    execution_time_ms: int
+) -> Dict[str, Any]:
+    return {
+        'prompt_template_id': prompt_template_id,
+        'email_id': email_id,
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'api_cost_usd': calculate_api_cost(model_name, input_tokens, output_tokens),
+        'extraction_success': extraction_success,
+        'confidence_score': confidence_score,
+        'manual_review_required': manual_review_required,
+        'execution_time_ms': execution_time_ms,
+    }
 
 
 def record_extraction_metrics(
@@ -74,15 +174,19 @@ def record_extraction_metrics(
     confidence_score: float | None,
     manual_review_required: bool | None,
     execution_time_ms: int
-) -> PromptPerformanceMetrics:
+) -> None:
     """
     Record extraction-level metrics for a prompt execution.
 
     REQ-PROMPT-02: Every extraction logs the prompt version used.
     REQ-PROMPT-04: Track tokens, time, success rate per version.
 
+    The row is buffered and written in a batch by MetricsBuffer, outside the
+    caller's transaction. Use record_extraction_metrics_sync when the created
+    record (e.g. its id) is needed.
+
     Args:
-        db: Database session
+        db: Database session (only used to find the engine)
         prompt_template_id: ID of prompt version used
         email_id: IncomingEmail ID being processed
         input_tokens: Input tokens for this API call
@@ -93,13 +197,10 @@ def record_extraction_metrics(
         manual_review_required: Was manual review triggered?
         execution_time_ms: Execution time in milliseconds
 
-    Returns:
-        Created PromptPerformanceMetrics record
-
     Example:
         from app.services.prompt_metrics_service import record_extraction_metrics
 
-        metric = record_extraction_metrics(
+        record_extraction_metrics(
             db=db,
             prompt_template_id=prompt.id,
             email_id=123,
@@ -112,35 +213,65 @@ def record_extraction_metrics(
             execution_time_ms=850
         )
     """
-    # Calculate API cost
-    api_cost = calculate_api_cost(model_name, input_tokens, output_tokens)
+    row = _metrics_row(
+        prompt_template_id, email_id, input_tokens, output_tokens, model_name,
+        extraction_success, confidence_score, manual_review_required, execution_time_ms
+    )
+    _metrics_buffer.add(db, row)
 
-    # Create metrics record
-    metric = PromptPerformanceMetrics(
-        prompt_template_id=prompt_template_id,
-        email_id=email_id,
-        input_tokens=input_tokens,
-        output_tokens=output_tokens,
-        api_cost_usd=api_cost,
-        extraction_success=extraction_success,
-        confidence_score=confidence_score,
-        manual_review_required=manual_review_required,
-        execution_time_ms=execution_time_ms
+    # Runs per extraction; skip building the event when debug is disabled
+    if logger.is_enabled_for(logging.DEBUG):
+        logger.debug(
+            "extraction_metrics_buffered",
+            prompt_template_id=prompt_template_id,
+            email_id=email_id,
+            success=extraction_success,
+            confidence=confidence_score,
+            cost_usd=float(row['api_cost_usd'])
+        )
+
+
+def record_extraction_metrics_sync(
+    db: Session,
+    prompt_template_id: int,
+    email_id: int,
+    input_tokens: int,
+    output_tokens: int,
+    model_name: str,
+    extraction_success: bool,
+    confidence_score: float | None,
+    manual_review_required: bool | None,
+    execution_time_ms: int
+) -> PromptPerformanceMetrics:
+    """
+    Record extraction-level metrics immediately and return the created record.
+
+    Slow path for callers that need the row: one INSERT and a commit on the
+    caller's session. Arguments are the same as record_extraction_metrics.
+
+    Returns:
+        Created PromptPerformanceMetrics record
+    """
+    row = _metrics_row(
+        prompt_template_id, email_id, input_tokens, output_tokens, model_name,
+        extraction_success, confidence_score, manual_review_required, execution_time_ms
     )
+    metric = PromptPerformanceMetrics(**row)
 
     db.add(metric)
+    # flush() assigns the id; reading it after commit would re-SELECT the expired row
+    db.flush()
+    metric_id = metric.id
     db.commit()
-    db.refresh(metric)
 
     logger.info(
         "extraction_metrics_recorded",
-        metric_id=metric.id,
+        metric_id=metric_id,
         prompt_template_id=prompt_template_id,
         email_id=email_id,
         success=extraction_success,
         confidence=confidence_score,
-        cost_usd=float(api_cost),
-        tokens_total=input_tokens + output_tokens
+        cost_usd=float(row['api_cost_usd'])
     )
 
     return metric
@@ -151,7 +282,8 @@ class PromptMetricsService:
     Service wrapper for prompt metrics operations.
 
     Provides:
-    - record: Log single extraction metrics
+    - record: Log single extraction metrics (buffered)
+    - record_sync: Log single extraction metrics and return the record
     - get_version_stats: Get aggregated stats for a version
 
     Per RESEARCH.md Pattern 3: Dual-table metrics tracking.
@@ -177,9 +309,9 @@ class PromptMetricsService:
         confidence_score: float | None = None,
         manual_review_required: bool | None = None,
         execution_time_ms: int = 0
-    ) -> PromptPerformanceMetrics:
+    ) -> None:
         """
-        Record metrics for single extraction.
+        Record metrics for single extraction (buffered).
 
         Convenience wrapper around record_extraction_metrics function.
 
@@ -194,12 +326,9 @@ class PromptMetricsService:
             manual_review_required: Was manual review triggered?
             execution_time_ms: Execution time in milliseconds
 
-        Returns:
-            Created PromptPerformanceMetrics record
-
         Example:
             service = PromptMetricsService(db)
-            metric = service.record(
+            service.record(
                 prompt_template_id=5,
                 email_id=123,
                 input_tokens=1500,
@@ -211,7 +340,40 @@ class PromptMetricsService:
                 execution_time_ms=850
             )
         """
-        return record_extraction_metrics(
+        record_extraction_metrics(
+            db=self.db,
+            prompt_template_id=prompt_template_id,
+            email_id=email_id,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            model_name=model_name,
+            extraction_success=extraction_success,
+            confidence_score=confidence_score,
+            manual_review_required=manual_review_required,
+            execution_time_ms=execution_time_ms
+        )
+
+    def record_sync(
+        self,
+        prompt_template_id: int,
+        email_id: int,
+        input_tokens: int,
+        output_tokens: int,
+        model_name: str,
+        extraction_success: bool,
+        confidence_score: float | None = None,
+        manual_review_required: bool | None = None,
+        execution_time_ms: int = 0
+    ) -> PromptPerformanceMetrics:
+        """
+        Record metrics for single extraction immediately.
+
+        Wrapper around record_extraction_metrics_sync; same arguments as record().
+
+        Returns:
+            Created PromptPerformanceMetrics record
+        """
+        return record_extraction_metrics_sync(
             db=self.db,
             prompt_template_id=prompt_template_id,
             email_id=email_id,
@@ -256,33 +418,27 @@ class PromptMetricsService:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        # Query metrics for time window
+        # Everything is computed in one aggregate; the filter is a range scan on
+        # idx_prompt_metrics_prompt_extracted (prompt_template_id, extracted_at).
         metrics = self.db.query(
             func.count(PromptPerformanceMetrics.id).label('total_extractions'),
-            func.sum(func.cast(PromptPerformanceMetrics.extraction_success, db.Integer)).label('successful_extractions'),
+            func.coalesce(
+                func.avg(case((PromptPerformanceMetrics.extraction_success, 1.0), else_=0.0)), 0.0
+            ).label('success_rate'),
             func.avg(PromptPerformanceMetrics.confidence_score).label('avg_confidence'),
-            func.avg(PromptPerformanceMetrics.execution_time_ms).label('avg_execution_time_ms'),
-            func.sum(PromptPerformanceMetrics.api_cost_usd).label('total_cost_usd')
+            func.coalesce(func.avg(PromptPerformanceMetrics.execution_time_ms), 0).label('avg_execution_time_ms'),
+            func.coalesce(func.sum(PromptPerformanceMetrics.api_cost_usd), 0).label('total_cost_usd')
         ).filter(
             PromptPerformanceMetrics.prompt_template_id == prompt_template_id,
             PromptPerformanceMetrics.extracted_at >= cutoff_date
-        ).first()
-
-        total_extractions = metrics.total_extractions or 0
-        successful_extractions = metrics.successful_extractions or 0
-        avg_confidence = float(metrics.avg_confidence) if metrics.avg_confidence is not None else None
-        avg_execution_time_ms = int(metrics.avg_execution_time_ms) if metrics.avg_execution_time_ms is not None else 0
-        total_cost_usd = float(metrics.total_cost_usd) if metrics.total_cost_usd is not None else 0.0
-
-        # Calculate success rate
-        success_rate = successful_extractions / total_extractions if total_extractions > 0 else 0.0
+        ).one()
 
         stats = {
-            'total_extractions': total_extractions,
-            'success_rate': success_rate,
-            'avg_confidence': avg_confidence,
-            'avg_execution_time_ms': avg_execution_time_ms,
-            'total_cost_usd': total_cost_usd
+            'total_extractions': metrics.total_extractions,
+            'success_rate': float(metrics.success_rate),
+            'avg_confidence': float(metrics.avg_confidence) if metrics.avg_confidence is not None else None,
+            'avg_execution_time_ms': int(metrics.avg_execution_time_ms),
+            'total_cost_usd': float(metrics.total_cost_usd)
         }
 
         logger.info(
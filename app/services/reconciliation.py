@@ -15,6 +15,9 @@ from app.models.idempotency_key import IdempotencyKey
 
 logger = structlog.get_logger()
 
+# Client fields read when comparing with PostgreSQL (skip the rest of the document)
+MONGO_CLIENT_PROJECTION = {'aktenzeichen': 1, 'final_creditor_list': 1}
+
 
 class ReconciliationService:
     """
@@ -140,25 +143,35 @@ class ReconciliationService:
         succeeded = 0
         failed = 0
 
+        # Write all pending payloads to MongoDB in one bulk round-trip
+        # The payload should contain: client_name, client_aktenzeichen, creditor_email,
+        # creditor_name, debt_amount, response_text, reference_numbers
+        updates = []
         for msg in pending_messages:
+            payload = msg.payload or {}
+            updates.append({
+                'client_name': payload.get('client_name', ''),
+                'client_aktenzeichen': payload.get('client_aktenzeichen'),
+                'creditor_email': payload.get('creditor_email', ''),
+                'creditor_name': payload.get('creditor_name', ''),
+                'new_debt_amount': payload.get('debt_amount', 0.0),
+                'response_text': payload.get('response_text'),
+                'reference_numbers': payload.get('reference_numbers'),
+            })
+
+        bulk_error = None
+        results = [False] * len(pending_messages)
+        try:
+            results = self.mongodb_service.update_creditor_debt_amounts_bulk(updates)
+        except Exception as e:
+            bulk_error = e
+
+        for msg, success in zip(pending_messages, results):
             retried += 1
 
             try:
-                # Extract payload data
-                payload = msg.payload
-
-                # Attempt MongoDB write
-                # The payload should contain: client_name, client_aktenzeichen, creditor_email,
-                # creditor_name, debt_amount, response_text, reference_numbers
-                success = self.mongodb_service.update_creditor_debt_amount(
-                    client_name=payload.get('client_name', ''),
-                    client_aktenzeichen=payload.get('client_aktenzeichen'),
-                    creditor_email=payload.get('creditor_email', ''),
-                    creditor_name=payload.get('creditor_name', ''),
-                    new_debt_amount=payload.get('debt_amount', 0.0),
-                    response_text=payload.get('response_text'),
-                    reference_numbers=payload.get('reference_numbers')
-                )
+                if bulk_error is not None:
+                    raise bulk_error
 
                 if success:
                     # Mark as processed
@@ -262,14 +275,18 @@ class ReconciliationService:
             mongo_client = None
 
             if client_aktenzeichen:
-                mongo_client = self.mongodb_service.get_client_by_aktenzeichen(client_aktenzeichen)
+                mongo_client = self.mongodb_service.get_client_by_aktenzeichen(
+                    client_aktenzeichen, projection=MONGO_CLIENT_PROJECTION
+                )
 
             if not mongo_client and client_name:
                 # Try by name
                 name_parts = client_name.strip().split(None, 1)
                 if len(name_parts) == 2:
                     first_name, last_name = name_parts
-                    mongo_client = self.mongodb_service.get_client_by_name(first_name, last_name)
+                    mongo_client = self.mongodb_service.get_client_by_name(
+                        first_name, last_name, projection=MONGO_CLIENT_PROJECTION
+                    )
 
             if not mongo_client:
                 # Missing in MongoDB
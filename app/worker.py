@@ -23,16 +23,28 @@ Process vs Thread Trade-offs:
     - PDF extraction is CPU-bound → processes better (added in Plan 03)
 """
 
+import logging
+
 import structlog
 from app.actors import broker
+from app.config import settings
 
 # Configure basic logging for worker
+# LOG_LEVEL (default INFO) matches the stdlib root level (setup_logging); the
+# filtering logger turns disabled levels into no-ops instead of running the
+# processor chain per call.
+_log_level = logging.getLevelName(settings.log_level.upper())
+if not isinstance(_log_level, int):
+    _log_level = logging.INFO
+
 structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.add_log_level,
         structlog.processors.JSONRenderer()
-    ]
+    ],
+    wrapper_class=structlog.make_filtering_bound_logger(_log_level),
+    cache_logger_on_first_use=True,
 )
 logger = structlog.get_logger()
 
@@ -0,0 +1,47 @@
+"""
+Tests for circuit breaker alert emails (CircuitBreakerEmailListener).
+"""
+
+import pybreaker
+import pytest
+from unittest.mock import patch
+
+from app.services.monitoring import circuit_breakers
+
+
+@pytest.fixture
+def sent_alerts():
+    """Capture alerts instead of sending them; run submitted alerts inline."""
+    sent = []
+
+    class InlineExecutor:
+        def submit(self, fn, *args):
+            fn(*args)
+
+    with patch.object(circuit_breakers, "_alert_executor", InlineExecutor()), \
+            patch.object(circuit_breakers.CircuitBreakerEmailListener, "_send_alert_email",
+                         lambda self, cb: sent.append(cb.name)):
+        yield sent
+
+
+def _trip(breaker: pybreaker.CircuitBreaker) -> None:
+    with pytest.raises((ZeroDivisionError, pybreaker.CircuitBreakerError)):
+        breaker.call(lambda: 1 / 0)
+
+
+class TestCircuitBreakerAlerts:
+
+    def test_alert_sent_when_circuit_opens(self, sent_alerts):
+        listener = circuit_breakers.CircuitBreakerEmailListener("ops@example.com")
+        breaker = pybreaker.CircuitBreaker(name="mongodb", fail_max=1, listeners=[listener])
+        _trip(breaker)
+        assert sent_alerts == ["mongodb"]
+
+    def test_reopening_within_cooldown_is_suppressed(self, sent_alerts):
+        listener = circuit_breakers.CircuitBreakerEmailListener("ops@example.com")
+        breaker = pybreaker.CircuitBreaker(name="mongodb", fail_max=1, reset_timeout=0, listeners=[listener])
+        other = pybreaker.CircuitBreaker(name="claude_api", fail_max=1, listeners=[listener])
+        for _ in range(3):
+            _trip(breaker)  # open -> half-open -> open again
+        _trip(other)
+        assert sent_alerts == ["mongodb", "claude_api"]
@@ -0,0 +1,80 @@
+"""
+Tests for the legacy MatchingEngine candidate query.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models.creditor_inquiry import CreditorInquiry
+from app.services.entity_extractor import ExtractedEntities
+from app.services.matching_engine import MatchingEngine
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    CreditorInquiry.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _inquiry(sent_at: datetime) -> CreditorInquiry:
+    return CreditorInquiry(
+        client_name="Max Mustermann",
+        creditor_name="Otto",
+        creditor_email="info@otto.de",
+        zendesk_ticket_id="T1",
+        sent_at=sent_at,
+    )
+
+
+class TestGetCandidateInquiries:
+
+    def test_later_same_day_inquiries_do_not_take_limit_slots(self, db, monkeypatch):
+        monkeypatch.setattr(settings, "match_max_candidates", 2)
+        received_at = datetime(2026, 10, 1, 12, 0)
+        db.add_all([
+            # Sent after the email arrived (same day): never candidates
+            _inquiry(received_at + timedelta(hours=1)),
+            _inquiry(received_at + timedelta(hours=2)),
+            # Valid candidates
+            _inquiry(received_at - timedelta(hours=1)),
+            _inquiry(received_at - timedelta(days=1)),
+        ])
+        db.commit()
+
+        candidates = MatchingEngine(db)._get_candidate_inquiries("info@otto.de", received_at)
+
+        assert [c.sent_at for c in candidates] == [
+            received_at - timedelta(hours=1),
+            received_at - timedelta(days=1),
+        ]
+
+
+class TestFindMatches:
+
+    def test_reused_engine_sees_updated_extracted_data(self, db):
+        received_at = datetime(2026, 10, 1, 12, 0)
+        inquiry = _inquiry(received_at - timedelta(days=1))
+        inquiry.reference_number = "AZ-12345"
+        db.add(inquiry)
+        db.commit()
+
+        engine = MatchingEngine(db)
+        extracted = ExtractedEntities(
+            is_creditor_reply=True, client_name="Erika Musterfrau", reference_numbers=["XY-999"]
+        )
+        first = engine.find_matches(extracted, "info@otto.de", received_at)[0]
+        assert first.component_scores["reference"] == 0.0
+
+        # Same list object and name string, mutated/rebound between calls
+        extracted.reference_numbers.append("AZ-12345")
+        extracted.client_name = "Max Mustermann"
+        second = engine.find_matches(extracted, "info@otto.de", received_at)[0]
+        assert second.component_scores["reference"] > 0.0
+        assert second.component_scores["client_name"] > first.component_scores["client_name"]
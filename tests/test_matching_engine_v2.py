@@ -14,7 +14,21 @@ from unittest.mock import Mock, patch, MagicMock
 from decimal import Decimal
 
 from app.services.matching_engine_v2 import MatchingEngineV2, MatchCandidate, MatchingResult
-from app.services.matching import ThresholdManager
+from app.services.matching import ThresholdManager, ExactMatchStrategy, FuzzyMatchStrategy
+from app.services.matching.signals import (
+    score_client_name,
+    score_client_names_batch,
+    score_reference_numbers,
+    score_reference_numbers_batch,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_threshold_cache():
+    """ThresholdManager caches across instances; isolate tests from each other."""
+    ThresholdManager.clear_cache()
+    yield
+    ThresholdManager.clear_cache()
 
 
 @pytest.fixture
@@ -31,6 +45,7 @@ def mock_inquiry():
     inquiry.client_name = "Max Mustermann"
     inquiry.client_name_normalized = "max mustermann"
     inquiry.creditor_email = "info@sparkasse.de"
+    inquiry.creditor_email_lc = "info@sparkasse.de"
     inquiry.reference_number = "AZ-12345"
     inquiry.sent_at = datetime.now() - timedelta(days=5)
     return inquiry
@@ -41,7 +56,7 @@ class TestMatchingEngineV2:
 
     def test_no_candidates_returns_no_recent_inquiry(self, mock_db):
         """Test that empty candidate list returns no_recent_inquiry status."""
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = []
+        mock_db.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = []
 
         engine = MatchingEngineV2(mock_db)
         result = engine.find_match(
@@ -56,7 +71,7 @@ class TestMatchingEngineV2:
 
     def test_both_signals_required(self, mock_db, mock_inquiry):
         """CONTEXT.MD: Both name AND reference required for match."""
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [mock_inquiry]
+        mock_db.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [mock_inquiry]
         # Mock threshold queries to return defaults
         mock_db.query.return_value.filter.return_value.first.return_value = None
 
@@ -85,7 +100,7 @@ class TestMatchingEngineV2:
         second_inquiry.reference_number = "AZ-99999"
         second_inquiry.sent_at = datetime.now() - timedelta(days=10)
 
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
+        mock_db.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
             mock_inquiry, second_inquiry
         ]
         mock_db.query.return_value.filter.return_value.first.return_value = None
@@ -106,7 +121,7 @@ class TestMatchingEngineV2:
 
     def test_explainability_jsonb_format(self, mock_db, mock_inquiry):
         """Test that scoring_details has correct JSONB structure."""
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [mock_inquiry]
+        mock_db.query.return_value.options.return_value.join.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [mock_inquiry]
         mock_db.query.return_value.filter.return_value.first.return_value = None
 
         engine = MatchingEngineV2(mock_db)
@@ -129,5 +144,154 @@ class TestMatchingEngineV2:
             assert scoring_details["filters_applied"]["both_signals_required"] is True
 
 
+class TestThresholdManagerCache:
+    """ThresholdManager in-process TTL cache."""
+
+    def test_threshold_cached_across_instances(self, mock_db):
+        row = Mock(threshold_value=Decimal("0.8000"))
+        mock_db.query.return_value.filter.return_value.first.return_value = row
+
+        assert ThresholdManager(mock_db).get_min_match("bank") == 0.8
+        assert ThresholdManager(mock_db).get_min_match("bank") == 0.8
+        assert mock_db.query.call_count == 1
+
+    def test_threshold_reloaded_after_ttl(self, mock_db):
+        row = Mock(threshold_value=Decimal("0.8000"))
+        mock_db.query.return_value.filter.return_value.first.return_value = row
+
+        manager = ThresholdManager(mock_db)
+        with patch("app.services.matching.thresholds.time.monotonic", return_value=1000.0):
+            manager.get_min_match("bank")
+        with patch("app.services.matching.thresholds.time.monotonic",
+                   return_value=1000.0 + ThresholdManager.CACHE_TTL_SECONDS + 1):
+            manager.get_min_match("bank")
+        assert mock_db.query.call_count == 2
+
+    def test_weights_returned_as_copy(self, mock_db):
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            Mock(weight_name="client_name", weight_value=Decimal("0.5000")),
+        ]
+
+        manager = ThresholdManager(mock_db)
+        manager.get_weights("default")["client_name"] = 0.0
+        assert manager.get_weights("default") == {"client_name": 0.5}
+
+    def test_config_cached_as_one_entry(self, mock_db):
+        mock_db.query.return_value.filter.return_value.first.return_value = Mock(
+            threshold_value=Decimal("0.8000"))
+        mock_db.query.return_value.filter.return_value.all.return_value = [
+            Mock(weight_name="client_name", weight_value=Decimal("0.5000")),
+        ]
+
+        config = ThresholdManager(mock_db).get_config("bank")
+        config.weights["client_name"] = 0.0
+        queries = mock_db.query.call_count
+
+        again = ThresholdManager(mock_db).get_config("bank")
+        assert (again.min_match, again.gap_threshold) == (0.8, 0.8)
+        assert again.weights == {"client_name": 0.5}
+        assert mock_db.query.call_count == queries
+
+
+class TestBatchScoring:
+    """Batched signal scorers must agree with the per-candidate scorers."""
+
+    NAMES = [
+        ("Max Mustermann", "max mustermann"),
+        ("Mustermann, Max", None),
+        ("Hans Schmidt", "hans schmidt"),
+        ("M. Mustermann", None),
+    ]
+    REFERENCES = ["AZ-12345", "az-12345 ", "AZ-I2345", None, "XY-999"]
+
+    def test_client_names_batch_matches_scalar(self):
+        batch = score_client_names_batch(self.NAMES, "Max Mustermann")
+        assert batch == [score_client_name(name, norm, "Max Mustermann") for name, norm in self.NAMES]
+
+    def test_reference_numbers_batch_matches_scalar(self):
+        extracted = ["AZ-I2345", "AZ-12345", "999"]
+        batch = score_reference_numbers_batch(self.REFERENCES, extracted)
+        assert batch == [score_reference_numbers(ref, extracted) for ref in self.REFERENCES]
+
+    def test_fuzzy_strategy_evaluate_batch_matches_evaluate(self, mock_inquiry):
+        other = Mock(client_name="Hans Schmidt", client_name_normalized=None, reference_number="AZ-99999")
+        extracted = {"client_name": "Max Mustermann", "reference_numbers": ["AZ-12345"]}
+        strategy = FuzzyMatchStrategy()
+
+        batch = strategy.evaluate_batch([mock_inquiry, other], extracted, {})
+        assert batch == [strategy.evaluate(inq, extracted, {}) for inq in (mock_inquiry, other)]
+
+    def test_exact_strategy_sees_refs_mutated_between_calls(self, mock_inquiry):
+        refs = ["XY-999"]
+        extracted = {"client_name": "Max Mustermann", "reference_numbers": refs}
+        strategy = ExactMatchStrategy()
+
+        assert strategy.evaluate(mock_inquiry, extracted, {}).score == 0.5
+        refs.append("az-12345")
+        assert strategy.evaluate_batch([mock_inquiry], extracted, {})[0].score == 1.0
+
+
+class TestCandidateRanking:
+    """Partial top-k ranking must agree with a full sort where it matters."""
+
+    @staticmethod
+    def _candidate(index, score, email):
+        inquiry = Mock()
+        inquiry.id = index
+        inquiry.creditor_email_lc = email
+        inquiry.sent_at = datetime(2026, 1, 1) + timedelta(days=index % 7)
+        return MatchCandidate(
+            inquiry=inquiry, total_score=score, component_scores={},
+            signal_details={}, strategy_used="fuzzy")
+
+    def _full_sort(self, candidates):
+        return sorted(candidates, key=lambda c: (c.total_score, c.inquiry.sent_at), reverse=True)
+
+    def test_large_pool_returns_sorted_prefix(self):
+        candidates = [self._candidate(i, (i * 37 % 11) / 10, f"c{i % 4}@x.de") for i in range(40)]
+
+        ranked = MatchingEngineV2._rank_candidates(candidates)
+        assert ranked == self._full_sort(candidates)[:len(ranked)]
+        assert len(ranked) < len(candidates)
+
+    def test_same_creditor_top_k_keeps_full_order(self):
+        candidates = [self._candidate(i, 0.9 - i / 100, "same@x.de") for i in range(20)]
+        candidates.append(self._candidate(99, 0.1, "other@x.de"))
+
+        ranked = MatchingEngineV2._rank_candidates(candidates)
+        assert ranked == self._full_sort(candidates)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestCandidateTiers:
+    """Candidate query keeps only the best tier (exact > domain > fallback)."""
+
+    @pytest.fixture
+    def engine(self):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.models.creditor_inquiry import CreditorInquiry
+
+        sql_engine = create_engine("sqlite://")
+        CreditorInquiry.__table__.create(sql_engine)
+        db = sessionmaker(bind=sql_engine)()
+        for hours, email in ((1, "Info@Otto.de"), (2, "mahnung@otto.de"), (3, "info@sparkasse.de")):
+            db.add(CreditorInquiry(
+                client_name="Max Mustermann", creditor_name="Otto", creditor_email=email,
+                zendesk_ticket_id="T1", sent_at=datetime(2026, 10, 1, 12) - timedelta(hours=hours),
+            ))
+        db.commit()
+        yield MatchingEngineV2(db)
+        db.close()
+
+    @pytest.mark.parametrize("from_email, expected", [
+        ("info@otto.de", ["Info@Otto.de"]),
+        ("buchhaltung@otto.de", ["Info@Otto.de", "mahnung@otto.de"]),
+        ("someone@example.com", ["Info@Otto.de", "mahnung@otto.de", "info@sparkasse.de"]),
+    ])
+    def test_best_tier_only(self, engine, from_email, expected):
+        candidates = engine._get_candidate_inquiries(from_email, datetime(2026, 10, 1, 12))
+        assert [c.creditor_email for c in candidates] == expected
@@ -2,8 +2,12 @@
 Test MongoDB creditor matching logic - specifically domain matching.
 """
 
+from unittest.mock import MagicMock
+
 import pytest
 
+from app.services.mongodb_client import MongoDBService, creditor_update_filter, match_creditor_name
+
 
 def match_email(cred_email: str, search_email: str) -> tuple[bool, str]:
     """
@@ -155,5 +159,183 @@ class TestRealWorldScenarios:
         assert matched is False
 
 
+
+class TestCreditorNameMatching:
+    """Test match_creditor_name from mongodb_client.py."""
+
+    def test_substring_match(self):
+        result = match_creditor_name("sparkasse bochum", {"sender_name": "Sparkasse"})
+        assert result == ("sender_name", "substring", 100.0)
+
+    def test_typo_and_word_order_match(self):
+        assert match_creditor_name("vodafone gmbh", {"sender_name": "Vodafon GmbH"}) is not None
+        assert match_creditor_name(
+            "telekom deutschland gmbh", {"glaeubiger_name": "Deutschland Telekom"}
+        )[0] == "glaeubiger_name"
+
+    def test_single_shared_word_does_not_match(self):
+        assert match_creditor_name("deutsche bank", {"sender_name": "Deutsche Telekom AG"}) is None
+
+    def test_empty_fields_skipped(self):
+        assert match_creditor_name("otto", {"sender_name": "", "glaeubiger_name": None}) is None
+
+
+class TestCreditorUpdateFilter:
+    """Positional updates are pinned to the creditor that was matched"""
+
+    def test_filter_pins_matched_element(self):
+        client = {
+            "_id": "c1",
+            "final_creditor_list": [
+                {"sender_email": "a@bank.de", "sender_name": "Bank A"},
+                {"sender_email": "info@otto.de", "sender_name": "Otto"},
+            ],
+        }
+        assert creditor_update_filter(client, 1) == {
+            "_id": "c1",
+            "final_creditor_list.1.sender_email": "info@otto.de",
+            "final_creditor_list.1.sender_name": "Otto",
+        }
+
+    def test_missing_fields_match_null(self):
+        client = {"_id": "c1", "final_creditor_list": [{"glaeubiger_name": "Otto"}]}
+        update_filter = creditor_update_filter(client, 0)
+        assert update_filter["final_creditor_list.0.sender_email"] is None
+        assert update_filter["final_creditor_list.0.sender_name"] is None
+
+
+class TestClientLookupCache:
+    """Aktenzeichen/ticket lookups are served from memory until TTL or a write"""
+
+    @pytest.fixture
+    def service(self):
+        service = MongoDBService()
+        service._initialized = True
+        service.client = MagicMock()
+        service.db = MagicMock()
+        service._clients = MagicMock()
+        service._clients_read = service._clients
+        service._breaker = MagicMock()
+        service._breaker.call.side_effect = lambda fn, *args, **kwargs: fn(*args, **kwargs)
+        service._clients.find_one.return_value = {"_id": "c1", "aktenzeichen": "542900"}
+        return service
+
+    def test_repeated_lookup_hits_cache(self, service):
+        first = service.get_client_by_aktenzeichen("542900")
+        first["aktenzeichen"] = "mutated"
+        second = service.get_client_by_aktenzeichen("542900")
+        assert second == {"_id": "c1", "aktenzeichen": "542900"}
+        assert service._clients.find_one.call_count == 1
+
+    def test_projection_is_part_of_key(self, service):
+        service.get_client_by_aktenzeichen("542900")
+        service.get_client_by_aktenzeichen("542900", {"aktenzeichen": 1})
+        assert service._clients.find_one.call_count == 2
+
+    def test_misses_are_not_cached(self, service):
+        service._clients.find_one.return_value = None
+        service.get_client_by_ticket("T1")
+        service.get_client_by_ticket("T1")
+        assert service._clients.find_one.call_count == 2
+
+    def test_write_evicts_client(self, service):
+        service.get_client_by_ticket("T1")
+        service._evict_cached_client("c1")
+        service.get_client_by_ticket("T1")
+        assert service._clients.find_one.call_count == 2
+
+    def test_concurrent_inserts_and_evictions(self, service, monkeypatch):
+        import threading
+
+        monkeypatch.setattr("app.services.mongodb_client.CLIENT_CACHE_MAX_SIZE", 8)
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(2000):
+                    service._client_cache_set(("ticket", f"{n}-{i}", None), {"_id": f"c{i % 16}"})
+                    service._evict_cached_client(f"c{(i + n) % 16}")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(service._client_cache) <= 8
+
+
+class TestBulkDebtUpdates:
+    """Bulk updates whose pinned filter matches nothing are reported as failed"""
+
+    @pytest.fixture
+    def service(self):
+        service = MongoDBService()
+        service._initialized = True
+        service.client = MagicMock()
+        service.db = MagicMock()
+        service._clients = MagicMock()
+        service._clients_read = service._clients
+        service._breaker = MagicMock()
+        service._breaker.call.side_effect = lambda fn, *args, **kwargs: fn(*args, **kwargs)
+        service._build_debt_update = lambda **update: (
+            {"_id": update["client_name"]},
+            {"_id": update["client_name"], "final_creditor_list.0.sender_email": "info@otto.de"},
+            {"$set": {"final_creditor_list.0.current_debt_amount": update["new_debt_amount"]}},
+        )
+        # c1's creditor list is unchanged, c2's was reordered by the portal
+        service._clients.bulk_write.return_value = MagicMock(matched_count=1)
+        service._clients.find.return_value = [
+            {"_id": "c1", "final_creditor_list": [{"sender_email": "info@otto.de"}]},
+            {"_id": "c2", "final_creditor_list": [{"sender_email": "a@bank.de"}, {"sender_email": "info@otto.de"}]},
+        ]
+        return service
+
+    @staticmethod
+    def _update(client_name):
+        return {"client_name": client_name, "client_aktenzeichen": None, "creditor_email": "info@otto.de",
+                "creditor_name": "Otto", "new_debt_amount": 100.0}
+
+    def test_unmatched_operation_returns_false(self, service):
+        assert service.update_creditor_debt_amounts_bulk([self._update("c1"), self._update("c2")]) == [True, False]
+        # Misses are found with one read, nothing is written twice
+        service._clients.find.assert_called_once()
+        service._clients.update_one.assert_not_called()
+
+    def test_all_matched_skips_recheck(self, service):
+        service._clients.bulk_write.return_value = MagicMock(matched_count=2)
+        assert service.update_creditor_debt_amounts_bulk([self._update("c1"), self._update("c2")]) == [True, True]
+        service._clients.find.assert_not_called()
+
+    def test_outbox_message_stays_unprocessed(self, service):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+
+        from app.models.outbox_message import OutboxMessage
+        from app.services.reconciliation import ReconciliationService
+
+        engine = create_engine("sqlite://")
+        OutboxMessage.__table__.create(engine)
+        session_factory = sessionmaker(bind=engine)
+        session = session_factory()
+        for client_name in ("c1", "c2"):
+            session.add(OutboxMessage(
+                aggregate_type="creditor_debt", aggregate_id=client_name, operation="update_debt",
+                payload={"client_name": client_name, "creditor_email": "info@otto.de",
+                         "creditor_name": "Otto", "debt_amount": 100.0},
+                idempotency_key=f"debt-{client_name}",
+            ))
+        session.commit()
+
+        counts = ReconciliationService(session_factory, service)._retry_pending_outbox(session)
+
+        assert counts["succeeded"] == 1 and counts["failed"] == 1
+        unprocessed = session.query(OutboxMessage).filter(OutboxMessage.processed_at.is_(None)).all()
+        assert [(m.aggregate_id, m.retry_count) for m in unprocessed] == [("c2", 1)]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
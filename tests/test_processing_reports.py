@@ -0,0 +1,86 @@
+"""
+Tests for processing report creation.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers incoming_emails for the foreign key)
+from app.models.processing_report import ProcessingReport
+from app.services.processing_reports import (
+    create_processing_report,
+    get_reports_by_date_range_page,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    ProcessingReport.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestCreateProcessingReport:
+
+    def test_second_call_updates_existing_report(self, db):
+        first = create_processing_report(
+            db, 1, {"client_name": "Max Mustermann"}, {}, 0.9, "high", False
+        )
+        second = create_processing_report(
+            db, 1, {"client_name": "Max Mustermann", "debt_amount": 1234.56}, {}, 0.4, "low", True,
+            review_reason="low_confidence"
+        )
+
+        assert db.query(ProcessingReport).count() == 1
+        assert second is first
+        assert second.overall_confidence == 0.4
+        assert second.review_reason == "low_confidence"
+        assert set(second.extracted_fields) == {"client_name", "debt_amount"}
+        assert second.missing_fields == ["creditor_name", "reference_numbers"]
+
+    def test_field_confidence_and_source(self, db):
+        report = create_processing_report(
+            db, 2,
+            {
+                "client_name": "Max Mustermann",
+                "debt_amount": 1234.56,
+                "extraction_metadata": {"primary_source": "pdf"},
+            },
+            {"agent_3_consolidation": {"confidence_scores": {"debt_amount": 0.95}}},
+            0.8, "medium", False
+        )
+
+        assert report.extracted_fields["debt_amount"] == {"value": 1234.56, "confidence": 0.95, "source": "pdf"}
+        assert report.extracted_fields["client_name"]["confidence"] == 0.5
+
+
+class TestGetReportsByDateRangePage:
+
+    def test_pages_cover_window_once(self, db):
+        created = datetime(2026, 10, 1, 12, 0)
+        for email_id in range(1, 6):
+            # Two reports share each timestamp to exercise the id tie-breaker
+            db.add(ProcessingReport(
+                email_id=email_id,
+                created_at=created + timedelta(minutes=email_id // 2),
+                extracted_fields={},
+                overall_confidence=0.9,
+                confidence_route="high",
+            ))
+        db.commit()
+
+        seen, cursor = [], None
+        while True:
+            reports, cursor = get_reports_by_date_range_page(
+                db, date(2026, 10, 1), date(2026, 10, 2), cursor, limit=2
+            )
+            seen.extend(r.email_id for r in reports)
+            if cursor is None:
+                break
+
+        assert seen == [5, 4, 3, 2, 1]
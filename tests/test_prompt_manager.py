@@ -0,0 +1,110 @@
+"""
+Tests for PromptVersionManager's active prompt cache.
+"""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.prompt_template import PromptTemplate
+from app.services.prompt_manager import ActivePrompt, PromptVersionManager, get_active_prompt
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    PromptTemplate.__table__.create(engine)
+    return engine
+
+
+@pytest.fixture
+def selects(engine):
+    """SELECT statements issued against the test database."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    PromptVersionManager.invalidate_cache()
+    yield session
+    session.close()
+    PromptVersionManager.invalidate_cache()
+
+
+@pytest.fixture
+def manager(db):
+    manager = PromptVersionManager(db)
+    manager.create_new_version("extraction", "email_body", "v1 {{ email_body }}")
+    manager.create_new_version("extraction", "email_body", "v2 {{ email_body }}")
+    manager.activate_version("extraction", "email_body", 1, "test")
+    return manager
+
+
+class TestActivePromptCache:
+
+    def test_repeated_lookups_hit_the_database_once(self, db, manager, selects):
+        selects.clear()
+        first = get_active_prompt(db, "extraction", "email_body")
+        second = get_active_prompt(db, "extraction", "email_body")
+        assert len(selects) == 1
+        assert first.version == second.version == 1
+        assert first is second
+        assert first.user_prompt_template == "v1 {{ email_body }}"
+
+    def test_activation_invalidates_cache(self, db, manager):
+        assert get_active_prompt(db, "extraction", "email_body").version == 1
+        manager.activate_version("extraction", "email_body", 2, "test")
+        assert get_active_prompt(db, "extraction", "email_body").version == 2
+
+    def test_returns_only_the_columns_callers_use(self, db, manager):
+        prompt = get_active_prompt(db, "extraction", "email_body")
+        assert isinstance(prompt, ActivePrompt)
+        assert prompt.model_name == "claude-sonnet-4-5-20250514"
+        assert prompt.max_tokens == 1024
+        with pytest.raises(FrozenInstanceError):
+            prompt.version = 2
+
+    def test_missing_prompt_is_cached_too(self, db, manager, selects):
+        selects.clear()
+        assert get_active_prompt(db, "classification", "email_intent") is None
+        assert get_active_prompt(db, "classification", "email_intent") is None
+        assert len(selects) == 1
+
+
+class TestActivateVersion:
+
+    def test_swaps_active_version(self, db, manager):
+        prompt = manager.activate_version("extraction", "email_body", 2, "test")
+        assert prompt.version == 2
+        active = db.query(PromptTemplate).filter(PromptTemplate.is_active == True).all()
+        assert [p.version for p in active] == [2]
+
+    def test_unknown_version_keeps_current_active(self, db, manager):
+        with pytest.raises(ValueError):
+            manager.activate_version("extraction", "email_body", 9, "test")
+        active = db.query(PromptTemplate).filter(PromptTemplate.is_active == True).all()
+        assert [p.version for p in active] == [1]
+
+
+class TestCreateNewVersion:
+
+    def test_no_refresh_select_after_insert(self, db, selects):
+        manager = PromptVersionManager(db)
+        selects.clear()
+        prompt = manager.create_new_version("classification", "email_intent", "{{ email_body }}")
+
+        assert prompt.id is not None
+        assert prompt.created_at is not None
+        assert prompt.version == 1
+        # Only the max(version) lookup
+        assert len(selects) == 1
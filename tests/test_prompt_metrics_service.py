@@ -0,0 +1,143 @@
+"""
+Tests for PromptMetricsService aggregates.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (registers incoming_emails for the foreign key)
+from app.models.prompt_metrics import PromptPerformanceMetrics
+from app.models.prompt_template import PromptTemplate
+from app.services.prompt_metrics_service import (
+    MetricsBuffer,
+    PromptMetricsService,
+    _metrics_row,
+    calculate_api_cost,
+    record_extraction_metrics_sync,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    PromptTemplate.__table__.create(engine)
+    PromptPerformanceMetrics.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _metric(success: bool, confidence: float | None, time_ms: int, cost: str) -> PromptPerformanceMetrics:
+    return PromptPerformanceMetrics(
+        prompt_template_id=1,
+        email_id=1,
+        input_tokens=1000,
+        output_tokens=200,
+        api_cost_usd=Decimal(cost),
+        extraction_success=success,
+        confidence_score=confidence,
+        manual_review_required=False,
+        execution_time_ms=time_ms,
+    )
+
+
+class TestGetVersionStats:
+
+    def test_aggregates_in_one_query(self, db):
+        db.add_all([
+            _metric(True, 0.9, 800, "0.006000"),
+            _metric(True, 0.7, 1000, "0.006000"),
+            _metric(False, None, 1200, "0.003000"),
+            _metric(True, 0.8, 1000, "0.005000"),
+        ])
+        db.commit()
+
+        stats = PromptMetricsService(db).get_version_stats(prompt_template_id=1)
+
+        assert stats['total_extractions'] == 4
+        assert stats['success_rate'] == pytest.approx(0.75)
+        assert stats['avg_confidence'] == pytest.approx(0.8)
+        assert stats['avg_execution_time_ms'] == 1000
+        assert stats['total_cost_usd'] == pytest.approx(0.02)
+
+    def test_empty_window(self, db):
+        stats = PromptMetricsService(db).get_version_stats(prompt_template_id=1)
+
+        assert stats == {
+            'total_extractions': 0,
+            'success_rate': 0.0,
+            'avg_confidence': None,
+            'avg_execution_time_ms': 0,
+            'total_cost_usd': 0.0,
+        }
+
+
+def _row(email_id: int) -> dict:
+    return _metrics_row(1, email_id, 1000, 200, 'default', True, 0.9, False, 500)
+
+
+class TestMetricsBuffer:
+
+    def test_writes_when_batch_is_full(self, db):
+        buffer = MetricsBuffer(batch_size=3, flush_interval=3600)
+        buffer.add(db, _row(1))
+        buffer.add(db, _row(2))
+        assert db.query(PromptPerformanceMetrics).count() == 0
+
+        buffer.add(db, _row(3))
+        assert db.query(PromptPerformanceMetrics).count() == 3
+
+    def test_flush_writes_partial_batch(self, db):
+        buffer = MetricsBuffer(batch_size=50, flush_interval=3600)
+        buffer.add(db, _row(1))
+        buffer.flush()
+        buffer.flush()
+        assert db.query(PromptPerformanceMetrics).count() == 1
+
+    def test_failed_batch_is_retried_once(self, db):
+        table = PromptPerformanceMetrics.__table__
+        buffer = MetricsBuffer(batch_size=50, flush_interval=3600)
+        buffer.add(db, _row(1))
+
+        table.drop(db.get_bind())
+        buffer.flush()  # fails, row re-queued
+        table.create(db.get_bind())
+        buffer.add(db, _row(2))
+        buffer.flush()
+        assert db.query(PromptPerformanceMetrics).count() == 2
+
+    def test_batch_failing_twice_is_dropped(self, db):
+        table = PromptPerformanceMetrics.__table__
+        buffer = MetricsBuffer(batch_size=50, flush_interval=3600)
+        buffer.add(db, _row(1))
+
+        table.drop(db.get_bind())
+        buffer.flush()
+        buffer.flush()  # second failure drops the row
+        table.create(db.get_bind())
+        buffer.flush()
+        assert db.query(PromptPerformanceMetrics).count() == 0
+
+    def test_sync_path_returns_record_with_id(self, db):
+        metric = record_extraction_metrics_sync(
+            db, 1, 1, 1000, 200, 'default', True, 0.9, False, 500
+        )
+        assert metric.id is not None
+        assert db.query(PromptPerformanceMetrics).count() == 1
+
+
+class TestCalculateApiCost:
+
+    @pytest.mark.parametrize("model, input_tokens, output_tokens, expected", [
+        ('claude-sonnet-4-5-20250514', 1000, 500, Decimal('0.010500')),
+        ('claude-haiku-4-20250514', 1500, 300, Decimal('0.000750')),
+        ('claude-haiku-4-20250514', 1, 1, Decimal('0.000002')),
+        ('unknown-model', 0, 0, Decimal('0.000000')),
+    ])
+    def test_exact_micro_usd(self, model, input_tokens, output_tokens, expected):
+        cost = calculate_api_cost(model, input_tokens, output_tokens)
+        assert cost == expected
+        assert cost.as_tuple().exponent == -6